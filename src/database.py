@@ -19,38 +19,174 @@ Key Features:
 """
 
 import sqlite3
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
-import json
+
+# Handle imports whether run as module or standalone
+try:
+    from .fastjson import dumps as _dumps, loads as _loads
+except ImportError:
+    from fastjson import dumps as _dumps, loads as _loads
+
+# Rows removed per DELETE statement during retention cleanup
+CLEANUP_CHUNK_SIZE = 5000
+
+# Column order of the positional intraday_snapshots INSERT
+INTRADAY_INSERT_COLUMNS = (
+    'captured_at', 'captured_date', 'ticker', 'expiration', 'strike', 'contract_type',
+    'spot_price', 'moneyness', 'dte',
+    'volume_cumulative', 'volume_delta',
+    'open_interest', 'close_price', 'high_price', 'low_price', 'vwap', 'transactions',
+    'delta', 'gamma', 'theta', 'vega', 'implied_vol',
+    'market_status', 'timeframe',
+)
+
+# daily_history columns filled from intraday_snapshots at EOD, and the
+# snapshot column each one is copied from (trade_date is bound separately)
+_HIST_COLS = (
+    'ticker', 'expiration', 'strike', 'contract_type',
+    'spot_close', 'moneyness', 'dte',
+    'volume', 'open_interest', 'close_price', 'high_price', 'low_price', 'vwap', 'transactions',
+    'delta', 'gamma', 'theta', 'vega', 'implied_vol',
+)
+_HIST_SRC = tuple(
+    {'spot_close': 'spot_price', 'volume': 'volume_cumulative'}.get(column, column)
+    for column in _HIST_COLS
+)
+
+# Every daily_history column, in table order
+_FULL_DAILY_COLS = ('trade_date',) + _HIST_COLS
+
+# Copies the last snapshot of each contract for a day, entirely inside SQLite
+_CONSOLIDATE_SQL = f"""
+    INSERT OR REPLACE INTO daily_history (trade_date, {', '.join(_HIST_COLS)})
+    SELECT ?, {', '.join('s.' + column for column in _HIST_SRC)}
+    FROM intraday_snapshots s
+    INNER JOIN (
+        SELECT ticker, MAX(captured_at) AS max_time
+        FROM intraday_snapshots
+        WHERE captured_date = ?
+        GROUP BY ticker
+    ) ls
+        ON s.ticker = ls.ticker
+        AND s.captured_at = ls.max_time
+    WHERE s.captured_date = ?
+"""
+
+# First snapshot of each contract in each hour of a day. SQLite takes the
+# bare columns from the row holding MIN(captured_at).
+_ROLLUP_SQL = """
+    INSERT OR REPLACE INTO intraday_hour_rollup (
+        trade_date, hour, ticker, captured_at, volume_cumulative, close_price, vwap
+    )
+    SELECT captured_date, captured_hour, ticker, MIN(captured_at),
+           volume_cumulative, close_price, vwap
+    FROM intraday_snapshots
+    WHERE captured_date = ?
+    GROUP BY captured_hour, ticker
+"""
+
+# Alert flags stored as individual trig_<flag> columns
+ALERT_TRIGGER_FLAGS = ('delta', 'multiplier', 'dormancy')
+
+_INSERT_ALERT_SQL = """
+    INSERT INTO alerts (
+        triggered_at, ticker, expiration, strike, contract_type,
+        moneyness, dte,
+        score, volume_current, volume_historical_avg, volume_historical_p90,
+        premium_notional, trigger_reasons,
+        trig_delta, trig_multiplier, trig_dormancy
+    ) VALUES (
+        :triggered_at, :ticker, :expiration, :strike, :contract_type,
+        :moneyness, :dte,
+        :score, :volume_current, :volume_historical_avg, :volume_historical_p90,
+        :premium_notional, :trigger_reasons,
+        :trig_delta, :trig_multiplier, :trig_dormancy
+    )
+"""
+
+
+# Extracts the INSERT parameters from a snapshot dict, in column order.
+# itemgetter does the 24 lookups in C and returns the tuple directly.
+_intraday_row = itemgetter(*INTRADAY_INSERT_COLUMNS)
+
+
+def _alert_params(alert: Dict) -> Dict:
+    """Promote trigger flags to their own columns and encode the JSON details."""
+    reasons = alert.get('trigger_reasons')
+    details = reasons
+    if isinstance(reasons, (str, bytes)):
+        # Already encoded; still read the flags out of it
+        try:
+            details = _loads(reasons)
+        except ValueError:
+            details = None
+
+    flags = details.get('flags', []) if isinstance(details, dict) else []
+    for flag in ALERT_TRIGGER_FLAGS:
+        alert[f'trig_{flag}'] = int(flag in flags)
+
+    if isinstance(reasons, dict):
+        alert['trigger_reasons'] = _dumps(reasons)
+
+    return alert
+
+
+@lru_cache(maxsize=32)
+def _cutoff_for(today: date, days_back: int) -> str:
+    return (today - timedelta(days=days_back)).isoformat()
+
+
+def _cutoff_date(days_back: int) -> str:
+    """ISO date N days before today, computed once per calendar day."""
+    return _cutoff_for(date.today(), days_back)
 
 
 class SPXDatabase:
     """Database manager for SPX options monitoring."""
 
-    def __init__(self, db_path: str = "spx_options.db"):
+    def __init__(self, db_path: str = "spx_options.db", check_same_thread: bool = True):
         """
         Initialize database connection and create schema if needed.
 
         Args:
             db_path: Path to SQLite database file
+            check_same_thread: Passed to sqlite3.connect. Pooled connections
+                disable it since the pool hands each one to a single thread
+                at a time.
         """
         self.db_path = db_path
+        self.check_same_thread = check_same_thread
         self.conn = None
+        self._in_txn = False  # True while an explicit transaction is open
         self.connect()
         self.create_schema()
 
     def connect(self):
         """Establish database connection with optimizations."""
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=self.check_same_thread,
+            cached_statements=256  # Prepared statement cache (default 128)
+        )
         self.conn.row_factory = sqlite3.Row  # Access columns by name
+        self.conn.isolation_level = None  # No implicit transactions; see transaction()
 
         # SQLite optimizations
+        self.conn.execute("PRAGMA page_size=8192")  # Only takes effect on a new database (before WAL)
         self.conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging for concurrency
         self.conn.execute("PRAGMA synchronous=NORMAL")  # Faster writes
         self.conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
         self.conn.execute("PRAGMA temp_store=MEMORY")  # Temp tables in RAM
         self.conn.execute("PRAGMA busy_timeout=30000")  # 30s wait on locks
+        self.conn.execute("PRAGMA mmap_size=1073741824")  # 1GB memory-mapped reads (whole file)
+        self.conn.execute("PRAGMA wal_autocheckpoint=10000")  # Fewer checkpoints during polling
 
     def create_schema(self):
         """Create database schema with indexes."""
@@ -65,6 +201,9 @@ class SPXDatabase:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 captured_at TEXT NOT NULL,           -- ISO timestamp of poll (e.g., '2025-12-03T10:30:00')
                 captured_date DATE NOT NULL,         -- Trading date (for grouping)
+                captured_hour INTEGER GENERATED ALWAYS AS (
+                    CAST(SUBSTR(captured_at, 12, 2) AS INTEGER)
+                ) VIRTUAL,                           -- Hour of poll, for same-hour comparisons
                 ticker TEXT NOT NULL,                -- Full option ticker (O:SPX251219P05000000)
                 expiration DATE NOT NULL,
                 strike REAL NOT NULL,
@@ -103,25 +242,66 @@ class SPXDatabase:
             )
         """)
 
+        self._migrate_intraday_captured_hour()
+
         # Indexes for intraday_snapshots
+        # (ticker, captured_date, captured_at) lookups use the UNIQUE index,
+        # which also serves the per-ticker same-hour reads
+        self.conn.execute("DROP INDEX IF EXISTS idx_intraday_lookup")
+        self.conn.execute("DROP INDEX IF EXISTS idx_intraday_hour")
+
+        # Yesterday's same-hour window by date; the captured_date prefix also
+        # serves retention cleanup (replaces idx_intraday_cleanup)
+        new_intraday_indexes = not self.conn.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_intraday_date_hour'
+        """).fetchone()
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_intraday_date_hour
+            ON intraday_snapshots(captured_date, captured_hour, ticker)
+        """)
+        self.conn.execute("DROP INDEX IF EXISTS idx_intraday_cleanup")
+
+        # Latest poll lookup and its per-expiration, strike-ordered reads
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_intraday_latest
+            ON intraday_snapshots(captured_at, expiration, strike)
+        """)
+
+        # Covering index for volume delta lookups (served from index pages alone)
         self.conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_intraday_lookup
-            ON intraday_snapshots(ticker, captured_date, captured_at)
+            CREATE INDEX IF NOT EXISTS idx_intraday_delta
+            ON intraday_snapshots(ticker, captured_date, captured_at DESC, volume_cumulative)
         """)
 
+        # INTRADAY HOUR ROLLUP TABLE
+        # --------------------------
+        # First snapshot of each contract per hour, written at EOD. Serves the
+        # dashboard's same-hour-yesterday comparison without rescanning the
+        # previous day's raw polls. Same retention as intraday_snapshots.
+
         self.conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_intraday_cleanup
-            ON intraday_snapshots(captured_date)
+            CREATE TABLE IF NOT EXISTS intraday_hour_rollup (
+                trade_date DATE NOT NULL,
+                hour INTEGER NOT NULL,
+                ticker TEXT NOT NULL,
+                captured_at TIMESTAMP NOT NULL,
+                volume_cumulative INTEGER,
+                close_price REAL,
+                vwap REAL,
+                PRIMARY KEY (trade_date, hour, ticker)
+            ) WITHOUT ROWID
         """)
 
         # DAILY HISTORY TABLE
         # -------------------
         # Consolidated end-of-day records. Used for anomaly detection baseline.
-        # 60-day rolling retention.
+        # 60-day rolling retention. Clustered on (trade_date, ticker) with no
+        # separate rowid b-tree.
+
+        self._retire_rowid_daily_history()
 
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS daily_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
                 trade_date DATE NOT NULL,
                 ticker TEXT NOT NULL,
                 expiration DATE NOT NULL,
@@ -149,14 +329,20 @@ class SPXDatabase:
                 vega REAL,
                 implied_vol REAL,
 
-                UNIQUE(trade_date, ticker)           -- One record per contract per day
-            )
+                PRIMARY KEY (trade_date, ticker)     -- One record per contract per day
+            ) WITHOUT ROWID
         """)
 
+        self._copy_legacy_daily_history()
+
         # Indexes for daily_history (critical for anomaly detection performance)
+        # Covers the comparison queries: the primary key (trade_date, ticker)
+        # is carried in every index entry of a WITHOUT ROWID table
+        self.conn.execute("DROP INDEX IF EXISTS idx_daily_moneyness")
         self.conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_daily_moneyness
-            ON daily_history(moneyness, dte, trade_date)
+            CREATE INDEX IF NOT EXISTS idx_daily_comparison
+            ON daily_history(moneyness, dte, trade_date,
+                             volume, open_interest, close_price, implied_vol)
         """)
 
         self.conn.execute("""
@@ -164,10 +350,8 @@ class SPXDatabase:
             ON daily_history(ticker, trade_date)
         """)
 
-        self.conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_daily_cleanup
-            ON daily_history(trade_date)
-        """)
+        # Retention deletes range-scan the primary key (trade_date first)
+        self.conn.execute("DROP INDEX IF EXISTS idx_daily_cleanup")
 
         # ALERTS TABLE
         # ------------
@@ -195,7 +379,10 @@ class SPXDatabase:
                 premium_notional REAL,               -- volume × price × 100
 
                 -- Trigger details
-                trigger_reasons TEXT,                -- JSON: which components fired
+                trigger_reasons TEXT,                -- JSON: flags + summary (display)
+                trig_delta INTEGER DEFAULT 0,        -- Volume delta threshold fired
+                trig_multiplier INTEGER DEFAULT 0,   -- Multiple of yesterday fired
+                trig_dormancy INTEGER DEFAULT 0,     -- Dormant contract woke up
 
                 -- Alert handling
                 acknowledged BOOLEAN DEFAULT 0,
@@ -209,8 +396,164 @@ class SPXDatabase:
             ON alerts(triggered_at DESC)
         """)
 
+        self._migrate_alert_trigger_columns()
+
+        # Unacknowledged alerts are the common dashboard filter
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_alerts_active
+            ON alerts(triggered_at DESC)
+            WHERE acknowledged = 0
+        """)
+
+        # Gather planner statistics once so new indexes are picked up
+        has_stats = self.conn.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'
+        """).fetchone()
+        if not has_stats:
+            self.conn.execute("ANALYZE")
+        elif new_intraday_indexes:
+            self.conn.execute("ANALYZE intraday_snapshots")
+
+    def _migrate_intraday_captured_hour(self):
+        """Add the generated captured_hour column to an existing intraday table."""
+        # table_xinfo (unlike table_info) lists generated columns
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_xinfo(intraday_snapshots)")}
+        if 'captured_hour' not in columns:
+            self.conn.execute("""
+                ALTER TABLE intraday_snapshots ADD COLUMN captured_hour INTEGER
+                GENERATED ALWAYS AS (CAST(SUBSTR(captured_at, 12, 2) AS INTEGER)) VIRTUAL
+            """)
+
+    def _retire_rowid_daily_history(self):
+        """
+        Move a pre-WITHOUT ROWID daily_history aside so it can be rebuilt.
+
+        Older databases keyed daily_history on an AUTOINCREMENT id plus a
+        UNIQUE(trade_date, ticker) index. The old table is renamed to
+        daily_history_legacy; _copy_legacy_daily_history() moves its rows
+        into the new table once that has been created.
+        """
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(daily_history)")}
+        if 'id' in columns:
+            self.conn.execute("ALTER TABLE daily_history RENAME TO daily_history_legacy")
+
+    def _copy_legacy_daily_history(self):
+        """Copy rows from daily_history_legacy (if present) and drop it."""
+        legacy = self.conn.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_history_legacy'
+        """).fetchone()
+        if not legacy:
+            return
+
+        columns = ', '.join(_FULL_DAILY_COLS)
+        with self.transaction():
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO daily_history ({columns})
+                SELECT {columns} FROM daily_history_legacy
+                ORDER BY trade_date, ticker
+            """)
+            self.conn.execute("DROP TABLE daily_history_legacy")
+
+    def _migrate_alert_trigger_columns(self):
+        """
+        Add the per-flag trigger columns to an existing alerts table.
+
+        Older databases only recorded the flags inside the trigger_reasons
+        JSON. The columns are added once and backfilled from that JSON so
+        readers can filter on them without parsing every row.
+        """
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(alerts)")}
+        missing = [flag for flag in ALERT_TRIGGER_FLAGS if f'trig_{flag}' not in existing]
+        if not missing:
+            return
+
+        with self.transaction():
+            for flag in missing:
+                self.conn.execute(
+                    f"ALTER TABLE alerts ADD COLUMN trig_{flag} INTEGER DEFAULT 0"
+                )
+                self.conn.execute(f"""
+                    UPDATE alerts
+                    SET trig_{flag} = 1
+                    WHERE json_valid(trigger_reasons)
+                      AND EXISTS (
+                          SELECT 1 FROM json_each(trigger_reasons, '$.flags')
+                          WHERE value = ?
+                      )
+                """, (flag,))
+
+    # =========================================================================
+    # TRANSACTION CONTROL
+    # =========================================================================
+
+    def begin(self):
+        """
+        Open an explicit write transaction.
+
+        Uses BEGIN IMMEDIATE so the write lock is taken up front rather than
+        on the first INSERT. Outside an explicit transaction every statement
+        commits on its own (autocommit), so grouping writes here makes the
+        whole batch share one WAL sync.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._in_txn = True
+
+    def commit_txn(self):
+        """Commit the transaction opened by begin()."""
+        self._in_txn = False
         self.conn.commit()
 
+    def rollback_txn(self):
+        """Roll back the transaction opened by begin()."""
+        self._in_txn = False
+        self.conn.rollback()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one transaction.
+
+        Usage:
+            with db.transaction():
+                db.insert_intraday_batch(snapshots)
+                db.insert_alert(alert)
+
+        Nested use joins the outer transaction. Rolls back on exception.
+        """
+        if self._in_txn:
+            yield self
+            return
+
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback_txn()
+            raise
+        else:
+            self.commit_txn()
+
+    @contextmanager
+    def savepoint(self, name: str = "sp"):
+        """
+        Nested rollback point, for use inside transaction().
+
+        On exception only the writes made under the savepoint are undone;
+        the enclosing transaction stays open and can still commit.
+
+        Args:
+            name: Savepoint name (internal constant, not user input)
+        """
+        self.conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute(f"ROLLBACK TO {name}")
+            self.conn.execute(f"RELEASE {name}")
+            raise
+        else:
+            self.conn.execute(f"RELEASE {name}")
+
     # =========================================================================
     # INTRADAY SNAPSHOT OPERATIONS
     # =========================================================================
@@ -253,7 +596,6 @@ class SPXDatabase:
             )
         """, snapshot)
 
-        self.conn.commit()
         return cursor.lastrowid
 
     def insert_intraday_batch(self, snapshots: List[Dict]) -> int:
@@ -266,37 +608,68 @@ class SPXDatabase:
         Returns:
             Number of rows inserted
         """
-        # Calculate volume deltas for all snapshots
-        for snapshot in snapshots:
-            volume_delta = self._calculate_volume_delta(
-                ticker=snapshot['ticker'],
-                captured_date=snapshot['captured_date'],
-                current_volume=snapshot.get('volume_cumulative', 0),
-                current_captured_at=snapshot['captured_at']
-            )
-            snapshot['volume_delta'] = volume_delta
-
-        self.conn.executemany("""
-            INSERT OR REPLACE INTO intraday_snapshots (
-                captured_at, captured_date, ticker, expiration, strike, contract_type,
-                spot_price, moneyness, dte,
-                volume_cumulative, volume_delta,
-                open_interest, close_price, high_price, low_price, vwap, transactions,
-                delta, gamma, theta, vega, implied_vol,
-                market_status, timeframe
-            ) VALUES (
-                :captured_at, :captured_date, :ticker, :expiration, :strike, :contract_type,
-                :spot_price, :moneyness, :dte,
-                :volume_cumulative, :volume_delta,
-                :open_interest, :close_price, :high_price, :low_price, :vwap, :transactions,
-                :delta, :gamma, :theta, :vega, :implied_vol,
-                :market_status, :timeframe
-            )
-        """, snapshots)
+        with self.transaction():
+            # Calculate volume deltas for all snapshots. A poll shares one
+            # (captured_date, captured_at) pair, so this is normally one query.
+            previous_by_poll = {}
+            for snapshot in snapshots:
+                poll_key = (snapshot['captured_date'], snapshot['captured_at'])
+                if poll_key not in previous_by_poll:
+                    previous_by_poll[poll_key] = self._get_previous_volumes(*poll_key)
+
+                previous = previous_by_poll[poll_key]
+                current_volume = snapshot.get('volume_cumulative', 0)
+                # First poll of the day: delta is the full cumulative volume
+                snapshot['volume_delta'] = current_volume - (previous.get(snapshot['ticker']) or 0)
+
+            # Bind plain tuples (only the inserted columns) streamed from a generator
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO intraday_snapshots (
+                    captured_at, captured_date, ticker, expiration, strike, contract_type,
+                    spot_price, moneyness, dte,
+                    volume_cumulative, volume_delta,
+                    open_interest, close_price, high_price, low_price, vwap, transactions,
+                    delta, gamma, theta, vega, implied_vol,
+                    market_status, timeframe
+                ) VALUES (
+                    ?, ?, ?, ?, ?, ?,
+                    ?, ?, ?,
+                    ?, ?,
+                    ?, ?, ?, ?, ?, ?,
+                    ?, ?, ?, ?, ?,
+                    ?, ?
+                )
+            """, map(_intraday_row, snapshots))
 
-        self.conn.commit()
         return len(snapshots)
 
+    def _get_previous_volumes(self, captured_date: str, captured_at: str) -> Dict[str, int]:
+        """
+        Get each ticker's cumulative volume from the last poll before captured_at.
+
+        Args:
+            captured_date: Trading date (ISO format)
+            captured_at: Current poll timestamp (excluded from lookup)
+
+        Returns:
+            Dictionary of ticker -> previous volume_cumulative
+        """
+        cursor = self.conn.execute("""
+            SELECT s.ticker, s.volume_cumulative
+            FROM intraday_snapshots s
+            INNER JOIN (
+                SELECT ticker, MAX(captured_at) AS prev_at
+                FROM intraday_snapshots
+                WHERE captured_date = ? AND captured_at < ?
+                GROUP BY ticker
+            ) p
+                ON s.ticker = p.ticker
+                AND s.captured_at = p.prev_at
+            WHERE s.captured_date = ?
+        """, (captured_date, captured_at, captured_date))
+
+        return {row['ticker']: row['volume_cumulative'] for row in cursor.fetchall()}
+
     def _calculate_volume_delta(self, ticker: str, captured_date: str, current_volume: int, current_captured_at: str = None) -> int:
         """
         Calculate volume delta by comparing to previous poll on same day.
@@ -358,15 +731,14 @@ class SPXDatabase:
         Returns:
             Number of rows deleted
         """
-        cutoff_date = (date.today() - timedelta(days=days_to_keep)).isoformat()
+        cutoff_date = _cutoff_date(days_to_keep)
 
-        cursor = self.conn.execute("""
-            DELETE FROM intraday_snapshots
-            WHERE captured_date < ?
-        """, (cutoff_date,))
+        deleted = self._delete_in_chunks('intraday_snapshots', 'captured_date', cutoff_date)
+        self._delete_in_chunks(
+            'intraday_hour_rollup', 'trade_date', cutoff_date, key='trade_date, hour, ticker'
+        )
 
-        self.conn.commit()
-        return cursor.rowcount
+        return deleted
 
     # =========================================================================
     # DAILY HISTORY OPERATIONS
@@ -380,7 +752,7 @@ class SPXDatabase:
             record: Consolidated daily data
 
         Returns:
-            Row ID of inserted record
+            Number of rows written
         """
         cursor = self.conn.execute("""
             INSERT OR REPLACE INTO daily_history (
@@ -396,26 +768,25 @@ class SPXDatabase:
             )
         """, record)
 
-        self.conn.commit()
-        return cursor.lastrowid
+        return cursor.rowcount
 
     def insert_daily_history_batch(self, records: List[Dict]) -> int:
         """Batch insert daily history records."""
-        self.conn.executemany("""
-            INSERT OR REPLACE INTO daily_history (
-                trade_date, ticker, expiration, strike, contract_type,
-                spot_close, moneyness, dte,
-                volume, open_interest, close_price, high_price, low_price, vwap, transactions,
-                delta, gamma, theta, vega, implied_vol
-            ) VALUES (
-                :trade_date, :ticker, :expiration, :strike, :contract_type,
-                :spot_close, :moneyness, :dte,
-                :volume, :open_interest, :close_price, :high_price, :low_price, :vwap, :transactions,
-                :delta, :gamma, :theta, :vega, :implied_vol
-            )
-        """, records)
+        with self.transaction():
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO daily_history (
+                    trade_date, ticker, expiration, strike, contract_type,
+                    spot_close, moneyness, dte,
+                    volume, open_interest, close_price, high_price, low_price, vwap, transactions,
+                    delta, gamma, theta, vega, implied_vol
+                ) VALUES (
+                    :trade_date, :ticker, :expiration, :strike, :contract_type,
+                    :spot_close, :moneyness, :dte,
+                    :volume, :open_interest, :close_price, :high_price, :low_price, :vwap, :transactions,
+                    :delta, :gamma, :theta, :vega, :implied_vol
+                )
+            """, records)
 
-        self.conn.commit()
         return len(records)
 
     def consolidate_day_to_history(self, trade_date: str) -> int:
@@ -423,7 +794,8 @@ class SPXDatabase:
         Consolidate all intraday snapshots for a given date into daily_history.
 
         This is the end-of-day (EOD) process that takes the last poll of each
-        contract and stores it as the canonical daily record.
+        contract and stores it as the canonical daily record. The day's
+        per-hour first snapshots are rolled up into intraday_hour_rollup.
 
         Args:
             trade_date: Date to consolidate (ISO format: 'YYYY-MM-DD')
@@ -431,53 +803,12 @@ class SPXDatabase:
         Returns:
             Number of records consolidated
         """
-        # Get the last snapshot of each contract for the given day
-        cursor = self.conn.execute("""
-            WITH last_snapshot AS (
-                SELECT
-                    ticker,
-                    MAX(captured_at) as max_time
-                FROM intraday_snapshots
-                WHERE captured_date = ?
-                GROUP BY ticker
-            )
-            SELECT s.*
-            FROM intraday_snapshots s
-            INNER JOIN last_snapshot ls
-                ON s.ticker = ls.ticker
-                AND s.captured_at = ls.max_time
-            WHERE s.captured_date = ?
-        """, (trade_date, trade_date))
-
-        records = []
-        for row in cursor.fetchall():
-            record = {
-                'trade_date': trade_date,
-                'ticker': row['ticker'],
-                'expiration': row['expiration'],
-                'strike': row['strike'],
-                'contract_type': row['contract_type'],
-                'spot_close': row['spot_price'],
-                'moneyness': row['moneyness'],
-                'dte': row['dte'],
-                'volume': row['volume_cumulative'],  # Final daily volume
-                'open_interest': row['open_interest'],
-                'close_price': row['close_price'],
-                'high_price': row['high_price'],
-                'low_price': row['low_price'],
-                'vwap': row['vwap'],
-                'transactions': row['transactions'],
-                'delta': row['delta'],
-                'gamma': row['gamma'],
-                'theta': row['theta'],
-                'vega': row['vega'],
-                'implied_vol': row['implied_vol']
-            }
-            records.append(record)
-
-        if records:
-            return self.insert_daily_history_batch(records)
-        return 0
+        cursor = self.conn.execute(_CONSOLIDATE_SQL, (trade_date, trade_date, trade_date))
+        consolidated = cursor.rowcount
+
+        self.conn.execute(_ROLLUP_SQL, (trade_date,))
+
+        return consolidated
 
     def get_historical_for_comparison(
         self,
@@ -501,12 +832,15 @@ class SPXDatabase:
             dte_tolerance: +/- range for DTE matching
 
         Returns:
-            List of historical records (most recent first)
+            List of historical records (most recent first) with the fields
+            used for scoring: trade_date, ticker, moneyness, dte, volume,
+            open_interest, close_price, implied_vol
         """
-        cutoff_date = (date.today() - timedelta(days=lookback_days)).isoformat()
+        cutoff_date = _cutoff_date(lookback_days)
 
         cursor = self.conn.execute("""
-            SELECT *
+            SELECT trade_date, ticker, moneyness, dte,
+                   volume, open_interest, close_price, implied_vol
             FROM daily_history
             WHERE moneyness BETWEEN ? AND ?
               AND dte BETWEEN ? AND ?
@@ -527,11 +861,13 @@ class SPXDatabase:
         Get historical data for a specific ticker.
 
         Useful for tracking OI changes or volume patterns for an exact contract.
+        Returns the daily volume, OI and pricing fields (most recent first).
         """
-        cutoff_date = (date.today() - timedelta(days=lookback_days)).isoformat()
+        cutoff_date = _cutoff_date(lookback_days)
 
         cursor = self.conn.execute("""
-            SELECT *
+            SELECT trade_date, spot_close, moneyness, dte,
+                   volume, open_interest, close_price, vwap, implied_vol
             FROM daily_history
             WHERE ticker = ?
               AND trade_date >= ?
@@ -550,15 +886,51 @@ class SPXDatabase:
         Returns:
             Number of rows deleted
         """
-        cutoff_date = (date.today() - timedelta(days=days_to_keep)).isoformat()
+        cutoff_date = _cutoff_date(days_to_keep)
 
-        cursor = self.conn.execute("""
-            DELETE FROM daily_history
-            WHERE trade_date < ?
-        """, (cutoff_date,))
+        return self._delete_in_chunks(
+            'daily_history', 'trade_date', cutoff_date, key='trade_date, ticker'
+        )
 
-        self.conn.commit()
-        return cursor.rowcount
+    def _delete_in_chunks(
+        self,
+        table: str,
+        date_column: str,
+        cutoff_date: str,
+        key: str = 'rowid'
+    ) -> int:
+        """
+        Delete rows older than cutoff_date in bounded chunks.
+
+        Each chunk commits on its own (autocommit), keeping every WAL append
+        small so the pages can be recycled, instead of one large delete
+        bloating the WAL. Inside transaction() the chunks share its commit.
+
+        Args:
+            table: Table name (internal constant, not user input)
+            date_column: Date column compared against the cutoff
+            cutoff_date: Rows with date_column < cutoff_date are deleted
+            key: Column(s) identifying a row (primary key for WITHOUT ROWID tables)
+
+        Returns:
+            Number of rows deleted
+        """
+        total_deleted = 0
+
+        while True:
+            cursor = self.conn.execute(f"""
+                DELETE FROM {table}
+                WHERE ({key}) IN (
+                    SELECT {key} FROM {table}
+                    WHERE {date_column} < ?
+                    LIMIT ?
+                )
+            """, (cutoff_date, CLEANUP_CHUNK_SIZE))
+
+            total_deleted += cursor.rowcount
+
+            if cursor.rowcount < CLEANUP_CHUNK_SIZE:
+                return total_deleted
 
     def get_daily_history_stats(self) -> Dict:
         """Get statistics about daily history table."""
@@ -570,8 +942,21 @@ class SPXDatabase:
                 MAX(trade_date) as latest_date
             FROM daily_history
         """)
+        stats = dict(cursor.fetchone())
+
+        # Planner statistics rows for daily_history (0 = never analyzed)
+        has_stats = self.conn.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'
+        """).fetchone()
+        stats['planner_stat_rows'] = self.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'daily_history'"
+        ).fetchone()[0] if has_stats else 0
 
-        return dict(cursor.fetchone())
+        return stats
+
+    def analyze(self):
+        """Recompute planner statistics for every table and index."""
+        self.conn.execute("ANALYZE")
 
     # =========================================================================
     # ALERT OPERATIONS
@@ -587,27 +972,28 @@ class SPXDatabase:
         Returns:
             Alert ID
         """
-        # Convert trigger_reasons dict to JSON string
-        if 'trigger_reasons' in alert and isinstance(alert['trigger_reasons'], dict):
-            alert['trigger_reasons'] = json.dumps(alert['trigger_reasons'])
+        cursor = self.conn.execute(_INSERT_ALERT_SQL, _alert_params(alert))
 
-        cursor = self.conn.execute("""
-            INSERT INTO alerts (
-                triggered_at, ticker, expiration, strike, contract_type,
-                moneyness, dte,
-                score, volume_current, volume_historical_avg, volume_historical_p90,
-                premium_notional, trigger_reasons
-            ) VALUES (
-                :triggered_at, :ticker, :expiration, :strike, :contract_type,
-                :moneyness, :dte,
-                :score, :volume_current, :volume_historical_avg, :volume_historical_p90,
-                :premium_notional, :trigger_reasons
-            )
-        """, alert)
-
-        self.conn.commit()
         return cursor.lastrowid
 
+    def insert_alerts_bulk(self, alerts: List[Dict]) -> int:
+        """
+        Insert many anomaly alerts in one transaction.
+
+        Args:
+            alerts: List of alert dicts, as accepted by insert_alert()
+
+        Returns:
+            Number of alerts inserted
+        """
+        if not alerts:
+            return 0
+
+        with self.transaction():
+            self.conn.executemany(_INSERT_ALERT_SQL, map(_alert_params, alerts))
+
+        return len(alerts)
+
     def get_recent_alerts(self, limit: int = 50, unacknowledged_only: bool = False) -> List[Dict]:
         """Get recent alerts, optionally filtering for unacknowledged."""
         query = """
@@ -633,7 +1019,6 @@ class SPXDatabase:
             WHERE id = ?
         """, (datetime.now().isoformat(), notes, alert_id))
 
-        self.conn.commit()
         return True
 
     # =========================================================================
@@ -641,10 +1026,32 @@ class SPXDatabase:
     # =========================================================================
 
     def close(self):
-        """Close database connection."""
+        """Close database connection, refreshing planner stats if needed."""
         if self.conn:
+            try:
+                # Re-analyzes only tables whose stats have drifted
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
             self.conn.close()
 
+    def checkpoint_wal(self):
+        """Fold the WAL back into the main database file and truncate it."""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def reindex(self, table: str):
+        """
+        Rebuild every index on a table so its b-tree pages are densely packed.
+
+        Rolling retention deletes from the old end of each index, leaving
+        sparse pages behind; rebuilding restores locality for the lookups
+        that follow.
+
+        Args:
+            table: Table name (internal constant, not user input)
+        """
+        self.conn.execute(f"REINDEX {table}")
+
     def vacuum(self):
         """Reclaim disk space and optimize database."""
         self.conn.execute("VACUUM")
@@ -660,3 +1067,112 @@ class SPXDatabase:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager cleanup."""
         self.close()
+
+
+# =============================================================================
+# CONNECTION POOL
+# =============================================================================
+
+class SPXDatabasePool:
+    """
+    Pool of long-lived SPXDatabase connections.
+
+    Opening a connection costs a file open, the PRAGMA setup and schema
+    checks, and starts with a cold page cache. The pool keeps up to `size`
+    connections open and hands them out one caller at a time.
+
+    Usage:
+        pool = SPXDatabasePool("spx_options.db", size=4)
+        with pool.acquire() as db:
+            db.get_recent_alerts()
+    """
+
+    def __init__(self, db_path: str, size: int = 4, read_only: bool = False):
+        """
+        Args:
+            db_path: Path to SQLite database file
+            size: Maximum number of open connections
+            read_only: Open connections with PRAGMA query_only, so a reader
+                can never take the write lock away from the poller
+        """
+        self.db_path = db_path
+        self.size = size
+        self.read_only = read_only
+        self._idle = queue.LifoQueue(maxsize=size)  # LIFO keeps the hottest cache in use
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self):
+        """Check out a connection, returning it to the pool afterwards."""
+        db = self._checkout()
+        try:
+            yield db
+        finally:
+            self._checkin(db)
+
+    def _checkout(self) -> SPXDatabase:
+        """Reuse an idle connection, open a new one, or wait for one."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if not can_create:
+            return self._idle.get()
+
+        try:
+            db = SPXDatabase(self.db_path, check_same_thread=False)
+            if self.read_only:
+                # Set after the schema check, which may need to write
+                db.conn.execute("PRAGMA query_only=1")
+            return db
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _checkin(self, db: SPXDatabase):
+        """Return a connection, discarding any work left uncommitted."""
+        if db.conn.in_transaction:
+            db.rollback_txn()
+        self._idle.put(db)
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                db = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            db.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pools: Dict[Tuple[str, bool], SPXDatabasePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str, size: int = 4, read_only: bool = False) -> SPXDatabasePool:
+    """
+    Get the process-wide pool for a database path, creating it on first use.
+
+    Args:
+        db_path: Path to SQLite database file
+        size: Pool size (only used when the pool is first created)
+        read_only: Use the read-only pool for this path instead of the
+            read-write one
+    """
+    key = (db_path, read_only)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SPXDatabasePool(db_path, size=size, read_only=read_only)
+            _pools[key] = pool
+        return pool
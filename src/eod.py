@@ -17,9 +17,9 @@ from datetime import date, datetime
 
 # Handle imports whether run as module or standalone
 try:
-    from .database import SPXDatabase
+    from .database import get_pool
 except ImportError:
-    from database import SPXDatabase
+    from database import get_pool
 
 # Configuration
 DB_PATH = os.environ.get('SPX_DB_PATH', 'spx_options.db')
@@ -52,39 +52,50 @@ def run_eod_consolidation(trade_date: str = None) -> dict:
     }
 
     try:
-        db = SPXDatabase(DB_PATH)
-
-        # Step 1: Consolidate intraday -> daily_history
-        print(f"  Consolidating intraday snapshots to daily history...")
-        consolidated = db.consolidate_day_to_history(trade_date)
-        stats['consolidated'] = consolidated
-        print(f"  Consolidated {consolidated} contracts")
-
-        # Step 2: Cleanup old intraday data
-        print(f"  Cleaning up intraday data older than {INTRADAY_RETENTION_DAYS} days...")
-        intraday_cleaned = db.cleanup_old_intraday_data(days_to_keep=INTRADAY_RETENTION_DAYS)
-        stats['intraday_cleaned'] = intraday_cleaned
-        print(f"  Removed {intraday_cleaned} old intraday records")
-
-        # Step 3: Cleanup old daily history
-        print(f"  Cleaning up daily history older than {DAILY_RETENTION_DAYS} days...")
-        daily_cleaned = db.cleanup_old_daily_history(days_to_keep=DAILY_RETENTION_DAYS)
-        stats['daily_cleaned'] = daily_cleaned
-        print(f"  Removed {daily_cleaned} old daily records")
-
-        # Step 4: Report database stats
-        db_stats = db.get_daily_history_stats()
-        print(f"\n  Database stats:")
-        print(f"    Daily history records: {db_stats['total_records']}")
-        print(f"    Trading days covered: {db_stats['trading_days']}")
-        if db_stats['earliest_date'] and db_stats['latest_date']:
-            print(f"    Date range: {db_stats['earliest_date']} to {db_stats['latest_date']}")
-
-        # Get database size
-        db_size_mb = db.get_database_size() / (1024 * 1024)
-        print(f"    Database size: {db_size_mb:.2f} MB")
-
-        db.close()
+        with get_pool(DB_PATH, size=1).acquire() as db:
+            # Step 1: Consolidate intraday -> daily_history
+            print(f"  Consolidating intraday snapshots to daily history...")
+            with db.transaction():
+                consolidated = db.consolidate_day_to_history(trade_date)
+            stats['consolidated'] = consolidated
+            print(f"  Consolidated {consolidated} contracts")
+
+            # Step 2: Cleanup old intraday data
+            print(f"  Cleaning up intraday data older than {INTRADAY_RETENTION_DAYS} days...")
+            intraday_cleaned = db.cleanup_old_intraday_data(days_to_keep=INTRADAY_RETENTION_DAYS)
+            stats['intraday_cleaned'] = intraday_cleaned
+            print(f"  Removed {intraday_cleaned} old intraday records")
+
+            # Step 3: Cleanup old daily history
+            print(f"  Cleaning up daily history older than {DAILY_RETENTION_DAYS} days...")
+            daily_cleaned = db.cleanup_old_daily_history(days_to_keep=DAILY_RETENTION_DAYS)
+            stats['daily_cleaned'] = daily_cleaned
+            print(f"  Removed {daily_cleaned} old daily records")
+
+            # Repack the intraday indexes left sparse by the rolling delete
+            if intraday_cleaned:
+                db.reindex('intraday_snapshots')
+
+            # Weekly full ANALYZE on Fridays (EOD only runs on trading days)
+            if date.fromisoformat(trade_date).weekday() == 4:
+                print(f"  Refreshing planner statistics (weekly ANALYZE)...")
+                db.analyze()
+
+            # Reclaim the WAL space used by the cleanup deletes
+            db.checkpoint_wal()
+
+            # Step 4: Report database stats
+            db_stats = db.get_daily_history_stats()
+            print(f"\n  Database stats:")
+            print(f"    Daily history records: {db_stats['total_records']}")
+            print(f"    Trading days covered: {db_stats['trading_days']}")
+            if db_stats['earliest_date'] and db_stats['latest_date']:
+                print(f"    Date range: {db_stats['earliest_date']} to {db_stats['latest_date']}")
+            print(f"    Planner stat rows: {db_stats['planner_stat_rows']}")
+
+            # Get database size
+            db_size_mb = db.get_database_size() / (1024 * 1024)
+            print(f"    Database size: {db_size_mb:.2f} MB")
 
     except Exception as e:
         stats['errors'].append(str(e))
@@ -0,0 +1,30 @@
+"""
+SPX Options Monitor - JSON Helpers
+===================================
+Thin wrappers around orjson with a stdlib json fallback.
+
+orjson decodes the large Polygon snapshot responses several times faster
+than the stdlib parser. When it is not installed everything still works,
+just slower.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> str:
+    """Serialize to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
@@ -18,12 +18,15 @@ Signals:
 import os
 import sys
 import signal
+import atexit
 import logging
+import logging.handlers
 import time
 import traceback
 import multiprocessing
+from multiprocessing.connection import wait
+from collections import deque
 from pathlib import Path
-from datetime import datetime
 
 # Ensure src directory is in path
 SRC_DIR = Path(__file__).parent.resolve()
@@ -43,16 +46,21 @@ except ImportError:
 
 LOG_DIR = Path(os.environ.get('SPX_LOG_DIR', PROJECT_ROOT / 'logs'))
 LOG_LEVEL = os.environ.get('SPX_LOG_LEVEL', 'INFO')
+DB_PATH = os.environ.get('SPX_DB_PATH', str(SRC_DIR / 'spx_options.db'))
+
+# Modules imported once into the forkserver template (POSIX), so each
+# (re)started child is forked with them already loaded
+FORKSERVER_PRELOAD = ['database', 'poller', 'scheduler', 'server']
 
 # Restart backoff settings
 MAX_RAPID_RESTARTS = 5          # Max restarts before entering cooldown
 RAPID_RESTART_WINDOW = 60       # Seconds - restarts within this window count as "rapid"
 RESTART_COOLDOWN = 300          # Seconds to wait after hitting max rapid restarts
 
-# Track restart times for backoff logic
+# Track restart times for backoff logic (oldest first)
 restart_history = {
-    'server': [],
-    'scheduler': []
+    'server': deque(),
+    'scheduler': deque()
 }
 
 # =============================================================================
@@ -62,6 +70,23 @@ restart_history = {
 logger = None
 
 
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders each wall-clock second's timestamp only once."""
+
+    _cache = (None, '')  # (epoch second, formatted string)
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        cached_sec, formatted = self._cache
+        if sec != cached_sec:
+            formatted = time.strftime(datefmt or self.default_time_format, self.converter(sec))
+            self._cache = (sec, formatted)
+
+        if datefmt:
+            return formatted
+        return self.default_msec_format % (formatted, record.msecs)
+
+
 def setup_logging():
     """Configure logging to both console and file."""
     global logger
@@ -77,24 +102,45 @@ def setup_logging():
 
     # Console handler
     console = logging.StreamHandler(sys.stdout)
-    console.setFormatter(logging.Formatter(log_format, date_format))
+    console.setFormatter(CachedTimeFormatter(log_format, date_format))
     logger.addHandler(console)
 
-    # File handler
-    log_file = LOG_DIR / f"main_{datetime.now().strftime('%Y-%m-%d')}.log"
+    # File handler, buffered: records are written in batches of up to 512,
+    # or immediately once a WARNING arrives. The supervisor logs rarely and
+    # its process died/restarting lines must reach disk before it can be killed
+    log_file = LOG_DIR / f"main_{time.strftime('%Y-%m-%d')}.log"
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setFormatter(logging.Formatter(log_format, date_format))
-    logger.addHandler(file_handler)
+    file_handler.setFormatter(CachedTimeFormatter(log_format, date_format))
+    file_buffer = logging.handlers.MemoryHandler(
+        capacity=512,
+        flushLevel=logging.WARNING,
+        target=file_handler,
+        flushOnClose=True
+    )
+    logger.addHandler(file_buffer)
+    atexit.register(file_buffer.flush)
 
     return logger
 
 
-def log(message: str, level: str = "INFO"):
-    """Log a message."""
+def flush_logs():
+    """Write out any buffered log records."""
     if logger:
-        getattr(logger, level.lower())(message)
+        for handler in logger.handlers:
+            handler.flush()
+
+
+def log(message: str, level: str = "INFO", *args):
+    """
+    Log a message.
+
+    Extra args are %-substituted into the message by the logger, only if the
+    record is actually emitted.
+    """
+    if logger:
+        getattr(logger, level.lower())(message, *args)
     else:
-        print(f"[{level}] {message}")
+        print(f"[{level}] {message % args if args else message}")
 
 
 def check_restart_backoff(proc_name: str) -> None:
@@ -105,22 +151,49 @@ def check_restart_backoff(proc_name: str) -> None:
     is exceeded within RAPID_RESTART_WINDOW seconds.
     """
     now = time.time()
+    history = restart_history[proc_name]
 
-    # Clean old entries outside the window
-    restart_history[proc_name] = [
-        t for t in restart_history[proc_name]
-        if now - t < RAPID_RESTART_WINDOW
-    ]
+    # Drop entries outside the window
+    while history and now - history[0] >= RAPID_RESTART_WINDOW:
+        history.popleft()
 
     # Check if we've hit the limit
-    if len(restart_history[proc_name]) >= MAX_RAPID_RESTARTS:
-        log(f"{proc_name} crashed {MAX_RAPID_RESTARTS} times in {RAPID_RESTART_WINDOW}s. "
-            f"Cooling down for {RESTART_COOLDOWN}s...", "ERROR")
+    if len(history) >= MAX_RAPID_RESTARTS:
+        log("%s crashed %d times in %ds. Cooling down for %ds...", "ERROR",
+            proc_name, MAX_RAPID_RESTARTS, RAPID_RESTART_WINDOW, RESTART_COOLDOWN)
         time.sleep(RESTART_COOLDOWN)
-        restart_history[proc_name] = []
+        history.clear()
 
     # Record this restart
-    restart_history[proc_name].append(now)
+    history.append(now)
+
+
+def warm_db() -> None:
+    """
+    Read the hot tables once so the OS page cache is primed for the children.
+
+    Server and scheduler each open their own connections after the fork; this
+    only pulls the file pages in so their first queries after a (re)start
+    don't pay for cold disk reads.
+    """
+    if not Path(DB_PATH).exists():
+        return
+
+    from database import SPXDatabase
+
+    start = time.time()
+    try:
+        with SPXDatabase(DB_PATH) as db:
+            db.conn.execute("SELECT COUNT(*) FROM daily_history").fetchone()
+            db.conn.execute(
+                "SELECT * FROM daily_history ORDER BY trade_date DESC LIMIT 1000"
+            ).fetchall()
+            db.conn.execute("SELECT COUNT(*) FROM intraday_snapshots").fetchone()
+    except Exception as e:
+        log("Database warm-up skipped: %s", "WARNING", e)
+        return
+
+    log("Database warm-up done in %.0fms", "INFO", (time.time() - start) * 1000)
 
 
 # =============================================================================
@@ -151,11 +224,18 @@ def run_scheduler():
 
 def main():
     """Main entry point - runs both server and scheduler."""
+    # Children are forked from a pre-imported template instead of starting
+    # cold; Windows only supports spawn
+    if sys.platform != 'win32':
+        multiprocessing.set_start_method('forkserver', force=True)
+        multiprocessing.set_forkserver_preload(FORKSERVER_PRELOAD)
+
     setup_logging()
 
     log("=" * 60)
     log("SPX Options Monitor")
     log("=" * 60)
+    warm_db()
     log("Starting API server and scheduler...")
 
     # Create processes
@@ -170,17 +250,18 @@ def main():
         log("Shutdown signal received...")
         for proc in processes:
             if proc.is_alive():
-                log(f"  Stopping {proc.name}...")
+                log("  Stopping %s...", "INFO", proc.name)
                 proc.terminate()
 
         # Wait for processes to finish
         for proc in processes:
             proc.join(timeout=5)
             if proc.is_alive():
-                log(f"  Force killing {proc.name}...", "WARNING")
+                log("  Force killing %s...", "WARNING", proc.name)
                 proc.kill()
 
         log("Shutdown complete.")
+        flush_logs()
         sys.exit(0)
 
     # Register signal handlers
@@ -189,37 +270,36 @@ def main():
 
     # Start processes
     server_proc.start()
-    log(f"API server started (PID: {server_proc.pid})")
+    log("API server started (PID: %s)", "INFO", server_proc.pid)
 
     scheduler_proc.start()
-    log(f"Scheduler started (PID: {scheduler_proc.pid})")
+    log("Scheduler started (PID: %s)", "INFO", scheduler_proc.pid)
     log("Press Ctrl+C to stop")
     log("=" * 60)
 
-    # Monitor processes
+    # Monitor processes: block on the children's sentinels until one exits
+    # (no polling, so restarts happen immediately)
+    targets = [
+        ('server', run_server, "spx-server"),
+        ('scheduler', run_scheduler, "spx-scheduler"),
+    ]
+
     try:
         while True:
-            # Check if any process died unexpectedly
-            if not server_proc.is_alive():
-                log(f"Server process died (exit code: {server_proc.exitcode})", "WARNING")
-                server_proc.join()  # Clean up zombie
-                check_restart_backoff('server')
-                log("Restarting server...")
-                server_proc = multiprocessing.Process(target=run_server, name="spx-server")
-                server_proc.start()
-                processes[0] = server_proc
-
-            if not scheduler_proc.is_alive():
-                log(f"Scheduler process died (exit code: {scheduler_proc.exitcode})", "WARNING")
-                scheduler_proc.join()  # Clean up zombie
-                check_restart_backoff('scheduler')
-                log("Restarting scheduler...")
-                scheduler_proc = multiprocessing.Process(target=run_scheduler, name="spx-scheduler")
-                scheduler_proc.start()
-                processes[1] = scheduler_proc
-
-            # Sleep before next check
-            time.sleep(5)
+            sentinels = {proc.sentinel: i for i, proc in enumerate(processes)}
+
+            for sentinel in wait(list(sentinels)):
+                i = sentinels[sentinel]
+                proc_name, target, name = targets[i]
+                proc = processes[i]
+
+                proc.join()  # Reap it so exitcode is populated
+                log("%s process died (exit code: %s)", "WARNING", proc_name.capitalize(), proc.exitcode)
+                check_restart_backoff(proc_name)
+                log("Restarting %s...", "INFO", proc_name)
+                proc = multiprocessing.Process(target=target, name=name)
+                proc.start()
+                processes[i] = proc
 
     except KeyboardInterrupt:
         shutdown()
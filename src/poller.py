@@ -14,10 +14,18 @@ Environment Variables:
 
 import os
 import sys
+import json
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, date
 from typing import Optional, Tuple, List, Dict
 import time
+import threading
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 
 # Load .env file if python-dotenv is available
 try:
@@ -28,9 +36,15 @@ except ImportError:
 
 # Handle imports whether run as module or standalone
 try:
-    from .database import SPXDatabase
+    from .database import SPXDatabase, get_pool
+    from . import fastjson
 except ImportError:
-    from database import SPXDatabase
+    from database import SPXDatabase, get_pool
+    import fastjson
+
+# Child of the scheduler's logger, so poll output lands in its console and
+# file handlers; standalone runs configure basic logging in main()
+logger = logging.getLogger("spx_scheduler.poller")
 
 # =============================================================================
 # CONFIGURATION
@@ -46,9 +60,16 @@ MAX_DTE = 90      # Up to ~3 months out
 MIN_MONEYNESS = 0.5  # 50% of spot (deep OTM)
 MAX_MONEYNESS = 0.99  # 1% OTM
 CONTRACT_TYPE = "put"
+SPOT_DRIFT_MARGIN = 0.05  # Widen discovery around a reused spot by this much
 
 # API Limits
 MAX_TICKERS_PER_REQUEST = 250
+SNAPSHOT_WORKERS = 8            # Concurrent snapshot batch requests
+DISCOVERY_WORKERS = 4           # Concurrent per-expiration chain requests
+DISCOVERY_CACHE_TTL = 1800      # Seconds a discovered chain is reused
+DISCOVERY_CACHE_MARGIN = 0.02   # Extra strike band fetched so small spot moves still hit
+API_RATE_LIMIT = 2.0            # Sustained Polygon requests per second
+API_BURST = 4                   # Requests allowed back-to-back before pacing
 
 # Database
 DB_PATH = os.environ.get('SPX_DB_PATH', 'spx_options.db')
@@ -72,6 +93,7 @@ MULTIPLIER_THRESHOLD = 5        # Flag if today > N× yesterday
 # EXPIRATION LOGIC
 # =============================================================================
 
+@lru_cache(maxsize=32)
 def get_third_friday(year: int, month: int) -> date:
     """
     Calculate the 3rd Friday of a given month (standard monthly expiration).
@@ -130,6 +152,16 @@ def find_target_expirations(
     if reference_date is None:
         reference_date = date.today()
 
+    return list(_find_target_expirations_cached(reference_date, min_dte, max_dte))
+
+
+@lru_cache(maxsize=32)
+def _find_target_expirations_cached(
+    reference_date: date,
+    min_dte: int,
+    max_dte: int
+) -> Tuple[Tuple[date, int], ...]:
+    """Memoized body of find_target_expirations (keyed on the reference date)."""
     expirations = get_monthly_expirations(reference_date, months_ahead=6)
 
     # Filter to those in DTE window
@@ -146,24 +178,73 @@ def find_target_expirations(
 
     # Return in-window expirations, sorted by DTE
     if in_window:
-        return sorted(in_window, key=lambda x: x[1])
+        return tuple(sorted(in_window, key=lambda x: x[1]))
 
     # Fallback: return nearest future expiration
     if nearest_future:
-        return [nearest_future]
+        return (nearest_future,)
 
     # Last resort: first available
     if expirations:
         dte = (expirations[0] - reference_date).days
-        return [(expirations[0], dte)]
+        return ((expirations[0], dte),)
 
-    return []
+    return ()
 
 
 # =============================================================================
 # API FUNCTIONS
 # =============================================================================
 
+# Token bucket shared by _throttle() across worker threads
+_throttle_lock = threading.Lock()
+_tokens = float(API_BURST)
+_tokens_at = 0.0
+
+# One keep-alive session for every Polygon call, so batches reuse the same
+# HTTPS connection instead of paying a TCP + TLS handshake each time.
+# Transient errors and rate limiting are retried with backoff. The pool holds
+# one connection per worker thread so none are discarded after a burst.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=max(SNAPSHOT_WORKERS, DISCOVERY_WORKERS),
+    max_retries=Retry(
+        total=3,
+        backoff_factor=2,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
+
+def _throttle() -> None:
+    """
+    Block until the token bucket allows another request.
+
+    Refills at API_RATE_LIMIT per second up to API_BURST, so a short burst
+    goes out at once and sustained traffic stays under the plan's limit
+    instead of being answered with 429s.
+    """
+    global _tokens, _tokens_at
+    with _throttle_lock:
+        now = time.monotonic()
+        _tokens = min(API_BURST, _tokens + (now - _tokens_at) * API_RATE_LIMIT)
+        _tokens_at = now
+        _tokens -= 1
+        # A negative balance is this caller's place in the queue
+        wait = -_tokens / API_RATE_LIMIT
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _api_get(url: str, params: Dict) -> Dict:
+    """Rate-limited GET against Polygon, returning the decoded JSON body."""
+    _throttle()
+    response = _SESSION.get(url, params=params, timeout=30)
+    response.raise_for_status()
+    return fastjson.loads(response.content)
+
+
 def fetch_option_chain(
     expiration_date: Optional[str] = None,
     contract_type: str = "put",
@@ -195,10 +276,7 @@ def fetch_option_chain(
     if strike_lte:
         params["strike_price.lte"] = strike_lte
 
-    response = requests.get(url, params=params, timeout=30)
-    response.raise_for_status()
-
-    data = response.json()
+    data = _api_get(url, params)
     return data.get("results", [])
 
 
@@ -219,29 +297,26 @@ def fetch_unified_snapshot(tickers: List[str]) -> List[Dict]:
         "ticker.any_of": ",".join(tickers),
     }
 
-    response = requests.get(url, params=params, timeout=30)
-    response.raise_for_status()
-
-    data = response.json()
+    data = _api_get(url, params)
     return data.get("results", [])
 
 
 def fetch_unified_snapshot_batched(tickers: List[str], batch_size: int = MAX_TICKERS_PER_REQUEST) -> List[Dict]:
     """
     Fetch unified snapshot in batches if more than 250 tickers.
-    """
-    all_results = []
-
-    for i in range(0, len(tickers), batch_size):
-        batch = tickers[i:i+batch_size]
-        print(f"  Fetching batch {i//batch_size + 1}: {len(batch)} tickers...")
 
-        results = fetch_unified_snapshot(batch)
-        all_results.extend(results)
+    Batches are fetched concurrently (SNAPSHOT_WORKERS threads sharing the
+    pooled session and rate limiter).
+    Results keep batch order.
+    """
+    batches = [tickers[i:i+batch_size] for i in range(0, len(tickers), batch_size)]
+    logger.info("  Fetching %d batch(es): %d tickers (sizes %s)...",
+                len(batches), len(tickers), ", ".join(str(len(batch)) for batch in batches))
 
-        # Rate limiting - be nice to the API
-        if i + batch_size < len(tickers):
-            time.sleep(0.5)
+    all_results = []
+    with ThreadPoolExecutor(max_workers=SNAPSHOT_WORKERS) as executor:
+        for results in executor.map(fetch_unified_snapshot, batches):
+            all_results.extend(results)
 
     return all_results
 
@@ -254,10 +329,14 @@ def transform_to_snapshot(
     contract: Dict,
     captured_at: str,
     captured_date: str,
-    spot_price: float
+    spot_price: float,
+    cap_date: Optional[date] = None
 ) -> Dict:
     """
     Transform API response to database snapshot format.
+
+    cap_date is captured_date as a date object; callers transforming a whole
+    batch pass it in so it is parsed once rather than per contract.
     """
     details = contract.get("details", {})
     session = contract.get("session", {})
@@ -268,9 +347,9 @@ def transform_to_snapshot(
 
     # Calculate DTE
     if expiration:
-        exp_date = datetime.strptime(expiration, "%Y-%m-%d").date()
-        cap_date = datetime.strptime(captured_date, "%Y-%m-%d").date()
-        dte = (exp_date - cap_date).days
+        if cap_date is None:
+            cap_date = date.fromisoformat(captured_date)
+        dte = (date.fromisoformat(expiration) - cap_date).days
     else:
         dte = None
 
@@ -308,11 +387,67 @@ def transform_to_snapshot(
 # ANOMALY DETECTION
 # =============================================================================
 
-def get_yesterday_volume_with_fallback(
+# Comparison data for a set of tickers, passed as one JSON array parameter
+YESTERDAY_INTRADAY_SQL = """
+    SELECT ticker, captured_hour, volume_cumulative
+    FROM intraday_snapshots
+    WHERE captured_date = ?
+      AND ticker IN (SELECT value FROM json_each(?))
+    ORDER BY ticker, captured_at
+"""
+
+RECENT_EOD_SQL = """
+    SELECT ticker, trade_date, volume
+    FROM daily_history
+    WHERE trade_date IN (?, ?)
+      AND ticker IN (SELECT value FROM json_each(?))
+"""
+
+
+def load_comparison_volumes(
     db: 'SPXDatabase',
+    tickers: List[str],
+    yesterday_date: str,
+    two_days_ago_date: str
+) -> Dict:
+    """
+    Fetch everything get_yesterday_volume_with_fallback() needs in bulk.
+
+    Runs one query per table instead of up to four queries per ticker.
+
+    Returns:
+        Dictionary with:
+        - "intraday": ticker -> [(hour, volume_cumulative), ...] for yesterday,
+          ordered by captured_at
+        - "eod": (ticker, trade_date) -> volume for yesterday and 2 days ago
+        - "yesterday" / "two_days_ago": the ISO dates used
+    """
+    # A single JSON array parameter keeps the SQL text fixed, so one
+    # prepared statement serves any ticker set
+    tickers_json = json.dumps(tickers)
+
+    intraday = {}
+    cursor = db.conn.execute(YESTERDAY_INTRADAY_SQL, (yesterday_date, tickers_json))
+    for ticker, hour, volume in cursor.fetchall():
+        intraday.setdefault(ticker, []).append((hour, volume))
+
+    cursor = db.conn.execute(
+        RECENT_EOD_SQL, (yesterday_date, two_days_ago_date, tickers_json)
+    )
+    eod = {(ticker, trade_date): volume for ticker, trade_date, volume in cursor.fetchall()}
+
+    return {
+        "intraday": intraday,
+        "eod": eod,
+        "yesterday": yesterday_date,
+        "two_days_ago": two_days_ago_date,
+    }
+
+
+def get_yesterday_volume_with_fallback(
+    comparison: Dict,
     ticker: str,
-    current_hour: int,
-    today_date: str
+    current_hour: int
 ) -> Tuple[Optional[int], str]:
     """
     Get yesterday's volume with tiered fallback logic.
@@ -323,6 +458,11 @@ def get_yesterday_volume_with_fallback(
     3. Yesterday any hour (most recent) from intraday_snapshots
     4. 2 days ago EOD from daily_history
 
+    Args:
+        comparison: Lookup data from load_comparison_volumes()
+        ticker: Contract ticker
+        current_hour: Hour of the current poll
+
     Returns:
         Tuple of (volume, source) where source is one of:
         - "yesterday_hour"  : Same hour ±1h from intraday
@@ -331,69 +471,41 @@ def get_yesterday_volume_with_fallback(
         - "2_days_ago_eod"  : EOD from 2 days ago
         - "none"            : No comparison data found
     """
-    today = date.fromisoformat(today_date)
-    yesterday_date = (today - timedelta(days=1)).isoformat()
-    two_days_ago_date = (today - timedelta(days=2)).isoformat()
+    snapshots = comparison["intraday"].get(ticker, ())
 
-    # Priority 1: Yesterday same hour (±1h) from intraday_snapshots
-    hour_start = max(0, current_hour - 1)
-    hour_end = min(23, current_hour + 1)
+    # Priority 1: Yesterday same hour (±1h), closest hour first,
+    # earliest snapshot on ties (snapshots are in captured_at order)
+    best = None
+    for hour, volume in snapshots:
+        distance = abs(hour - current_hour)
+        if distance <= 1 and (best is None or distance < best[0]):
+            best = (distance, volume)
 
-    cursor = db.conn.execute("""
-        SELECT volume_cumulative
-        FROM intraday_snapshots
-        WHERE ticker = ?
-          AND captured_date = ?
-          AND CAST(SUBSTR(captured_at, 12, 2) AS INTEGER) BETWEEN ? AND ?
-        ORDER BY ABS(CAST(SUBSTR(captured_at, 12, 2) AS INTEGER) - ?) ASC
-        LIMIT 1
-    """, (ticker, yesterday_date, hour_start, hour_end, current_hour))
-
-    row = cursor.fetchone()
-    if row and row[0] is not None:
-        return (row[0], "yesterday_hour")
+    if best is not None and best[1] is not None:
+        return (best[1], "yesterday_hour")
 
     # Priority 2: Yesterday EOD from daily_history
-    cursor = db.conn.execute("""
-        SELECT volume
-        FROM daily_history
-        WHERE ticker = ? AND trade_date = ?
-        LIMIT 1
-    """, (ticker, yesterday_date))
-
-    row = cursor.fetchone()
-    if row and row[0] is not None:
-        return (row[0], "yesterday_eod")
+    volume = comparison["eod"].get((ticker, comparison["yesterday"]))
+    if volume is not None:
+        return (volume, "yesterday_eod")
 
     # Priority 3: Yesterday any hour (most recent) from intraday_snapshots
-    cursor = db.conn.execute("""
-        SELECT volume_cumulative
-        FROM intraday_snapshots
-        WHERE ticker = ? AND captured_date = ?
-        ORDER BY captured_at DESC
-        LIMIT 1
-    """, (ticker, yesterday_date))
-
-    row = cursor.fetchone()
-    if row and row[0] is not None:
-        return (row[0], "yesterday_any")
+    if snapshots and snapshots[-1][1] is not None:
+        return (snapshots[-1][1], "yesterday_any")
 
     # Priority 4: 2 days ago EOD from daily_history (handles weekends/holidays)
-    cursor = db.conn.execute("""
-        SELECT volume
-        FROM daily_history
-        WHERE ticker = ? AND trade_date = ?
-        LIMIT 1
-    """, (ticker, two_days_ago_date))
-
-    row = cursor.fetchone()
-    if row and row[0] is not None:
-        return (row[0], "2_days_ago_eod")
+    volume = comparison["eod"].get((ticker, comparison["two_days_ago"]))
+    if volume is not None:
+        return (volume, "2_days_ago_eod")
 
     # No comparison data found
     return (None, "none")
 
 
+# Contract fields copied verbatim from a snapshot into its alert
+_alert_contract_fields = itemgetter('strike', 'expiration', 'moneyness', 'dte', 'contract_type')
+
+
 def detect_anomalies(snapshots: List[Dict], db: 'SPXDatabase', captured_at: str) -> List[Dict]:
     """
     Analyze snapshots for unusual volume activity compared to yesterday.
@@ -405,7 +517,9 @@ def detect_anomalies(snapshots: List[Dict], db: 'SPXDatabase', captured_at: str)
     # Parse current timestamp
     current_dt = datetime.strptime(captured_at, "%Y-%m-%dT%H:%M:%S")
     current_hour = current_dt.hour
-    today_date = current_dt.date().isoformat()
+    today = current_dt.date()
+    yesterday_date = (today - timedelta(days=1)).isoformat()
+    two_days_ago_date = (today - timedelta(days=2)).isoformat()
 
     # Track comparison data sources for logging
     comparison_stats = {
@@ -415,10 +529,10 @@ def detect_anomalies(snapshots: List[Dict], db: 'SPXDatabase', captured_at: str)
         "2_days_ago_eod": 0,
         "none": 0
     }
-    contracts_evaluated = 0
-
+    # Apply the volume and premium floors first, so comparison data is
+    # only fetched for contracts that can actually alert
+    candidates = []
     for snapshot in snapshots:
-        ticker = snapshot['ticker']
         volume_today = snapshot.get('volume_cumulative', 0) or 0
         close_price = snapshot.get('close_price', 0) or 0
 
@@ -433,11 +547,22 @@ def detect_anomalies(snapshots: List[Dict], db: 'SPXDatabase', captured_at: str)
         if notional < PREMIUM_FLOOR:
             continue
 
-        contracts_evaluated += 1
+        candidates.append((snapshot, volume_today, notional))
+
+    contracts_evaluated = len(candidates)
+    comparison = load_comparison_volumes(
+        db,
+        [snapshot['ticker'] for snapshot, _, _ in candidates],
+        yesterday_date,
+        two_days_ago_date
+    )
+
+    for snapshot, volume_today, notional in candidates:
+        ticker = snapshot['ticker']
 
         # Look up yesterday's volume with fallback logic
         volume_yesterday, comparison_source = get_yesterday_volume_with_fallback(
-            db, ticker, current_hour, today_date
+            comparison, ticker, current_hour
         )
         comparison_stats[comparison_source] += 1
 
@@ -475,14 +600,15 @@ def detect_anomalies(snapshots: List[Dict], db: 'SPXDatabase', captured_at: str)
             else:
                 delta_str = f"+{volume_delta} (from 0)"
 
+            strike, expiration, moneyness, dte, contract_type = _alert_contract_fields(snapshot)
             alert = {
                 "triggered_at": captured_at,
                 "ticker": ticker,
-                "strike": snapshot.get('strike'),
-                "expiration": snapshot.get('expiration'),
-                "moneyness": snapshot.get('moneyness'),
-                "dte": snapshot.get('dte'),
-                "contract_type": snapshot.get('contract_type', 'put'),
+                "strike": strike,
+                "expiration": expiration,
+                "moneyness": moneyness,
+                "dte": dte,
+                "contract_type": contract_type,
                 "volume_today": volume_today,
                 "volume_yesterday": volume_yesterday,
                 "volume_delta": volume_delta,
@@ -493,19 +619,10 @@ def detect_anomalies(snapshots: List[Dict], db: 'SPXDatabase', captured_at: str)
             }
             alerts.append(alert)
 
-    # Log comparison data availability
+    # Log comparison data availability as a single line
     if contracts_evaluated > 0:
-        print(f"  [COMPARISON] Data sources for {contracts_evaluated} contracts:")
-        if comparison_stats["yesterday_hour"] > 0:
-            print(f"    - Yesterday same hour: {comparison_stats['yesterday_hour']}")
-        if comparison_stats["yesterday_eod"] > 0:
-            print(f"    - Yesterday EOD: {comparison_stats['yesterday_eod']}")
-        if comparison_stats["yesterday_any"] > 0:
-            print(f"    - Yesterday other hour: {comparison_stats['yesterday_any']}")
-        if comparison_stats["2_days_ago_eod"] > 0:
-            print(f"    - 2 days ago EOD: {comparison_stats['2_days_ago_eod']}")
-        if comparison_stats["none"] > 0:
-            print(f"    - No comparison data: {comparison_stats['none']} (dormancy check skipped)")
+        sources = " ".join(f"{source}={count}" for source, count in comparison_stats.items() if count)
+        logger.info("  [COMPARISON] contracts=%d %s", contracts_evaluated, sources)
 
     return alerts
 
@@ -513,26 +630,20 @@ def detect_anomalies(snapshots: List[Dict], db: 'SPXDatabase', captured_at: str)
 def log_alerts(alerts: List[Dict]) -> None:
     """Log detected anomalies to console."""
     if not alerts:
-        print("  [DETECTION] No anomalies detected")
+        logger.info("  [DETECTION] No anomalies detected")
         return
 
-    print(f"  [DETECTION] {len(alerts)} anomaly(s) detected:")
+    logger.info("  [DETECTION] %d anomaly(s) detected:", len(alerts))
     for alert in alerts:
-        strike = alert['strike']
-        exp = alert['expiration']
-        vol = alert['volume_today']
-        delta = alert['volume_delta']
-        notional = alert['notional']
-        flags = ', '.join(alert['flags'])
-
-        print(f"    [ALERT] Strike {strike} ({exp}) | Vol {vol} (+{delta}) | ${notional:,.0f} | {flags}")
+        logger.info("    [ALERT] Strike %s (%s) | Vol %s (+%s) | $%s | %s",
+                    alert['strike'], alert['expiration'], alert['volume_today'],
+                    alert['volume_delta'], f"{alert['notional']:,.0f}", ", ".join(alert['flags']))
 
 
 def store_alerts(alerts: List[Dict], db: 'SPXDatabase') -> int:
-    """Store alerts to database."""
-    stored = 0
-    for alert in alerts:
-        db_alert = {
+    """Store alerts to database in a single batched insert."""
+    db_alerts = [
+        {
             'triggered_at': alert['triggered_at'],
             'ticker': alert['ticker'],
             'expiration': alert['expiration'],
@@ -547,10 +658,10 @@ def store_alerts(alerts: List[Dict], db: 'SPXDatabase') -> int:
             'premium_notional': alert['notional'],
             'trigger_reasons': {'flags': alert['flags'], 'summary': alert['summary']}
         }
-        db.insert_alert(db_alert)
-        stored += 1
+        for alert in alerts
+    ]
 
-    return stored
+    return db.insert_alerts_bulk(db_alerts)
 
 
 # =============================================================================
@@ -587,38 +698,76 @@ def fetch_spot_price() -> Tuple[Optional[float], Optional[str]]:
         return (None, f"API error fetching spot price: {e}")
 
 
+# expiration_str -> (fetched_at, band_min, band_max, [(strike, ticker), ...])
+_discovery_cache: Dict[str, Tuple[float, float, float, List[Tuple[float, str]]]] = {}
+
+
 def fetch_expiration_contracts(
     expiration_str: str,
     spot_price: float,
     min_strike: float,
     max_strike: float
 ) -> Tuple[List[str], Optional[str]]:
-    """Fetch and filter contracts for a single expiration."""
-    try:
-        chain_results = fetch_option_chain(
-            expiration_date=expiration_str,
-            contract_type=CONTRACT_TYPE,
-            limit=250
-        )
-    except requests.exceptions.RequestException as e:
-        return ([], f"Option chain API error for {expiration_str}: {e}")
+    """
+    Fetch and filter contracts for a single expiration.
 
-    if not chain_results:
-        return ([], None)
+    The listed strikes change rarely within a day, so each chain is fetched
+    over a band DISCOVERY_CACHE_MARGIN wider than requested and reused for
+    DISCOVERY_CACHE_TTL seconds while the requested band still fits inside.
+    """
+    now = time.monotonic()
+    cached = _discovery_cache.get(expiration_str)
 
-    # Filter to target strike range
-    target_tickers = []
-    for contract in chain_results:
-        details = contract.get("details", {})
-        strike = details.get("strike_price")
-        ticker = details.get("ticker")
+    if (cached and now - cached[0] < DISCOVERY_CACHE_TTL
+            and cached[1] <= min_strike and max_strike <= cached[2]):
+        strikes = cached[3]
+    else:
+        band_min = min_strike * (1 - DISCOVERY_CACHE_MARGIN)
+        band_max = max_strike * (1 + DISCOVERY_CACHE_MARGIN)
+        try:
+            chain_results = fetch_option_chain(
+                expiration_date=expiration_str,
+                contract_type=CONTRACT_TYPE,
+                strike_gte=band_min,
+                strike_lte=band_max,
+                limit=250
+            )
+        except requests.exceptions.RequestException as e:
+            return ([], f"Option chain API error for {expiration_str}: {e}")
+
+        strikes = [
+            (strike, ticker)
+            for contract in chain_results
+            if (details := contract.get("details"))
+            and (strike := details.get("strike_price"))
+            and (ticker := details.get("ticker"))
+        ]
+        _discovery_cache[expiration_str] = (now, band_min, band_max, strikes)
 
-        if strike and ticker and min_strike <= strike <= max_strike:
-            target_tickers.append(ticker)
+    # Filter to target strike range
+    target_tickers = [
+        ticker for strike, ticker in strikes
+        if min_strike <= strike <= max_strike
+    ]
 
     return (target_tickers, None)
 
 
+# (captured_date, spot) from the last poll that fetched snapshots. Later polls the same
+# day discover contracts around it and take the live spot from the snapshot
+# batch, skipping the separate spot-price lookup.
+_last_spot: Optional[Tuple[str, float]] = None
+
+
+def spot_from_results(results: List[Dict]) -> Optional[float]:
+    """Underlying SPX value reported on the first snapshot that has one."""
+    for contract in results:
+        value = contract.get("underlying_asset", {}).get("value")
+        if value:
+            return value
+    return None
+
+
 def poll_spx_options() -> Tuple[int, Optional[str]]:
     """
     Main polling function. Fetches SPX put data across multiple expirations.
@@ -632,7 +781,7 @@ def poll_spx_options() -> Tuple[int, Optional[str]]:
     captured_at = now.strftime("%Y-%m-%dT%H:%M:%S")
     captured_date = now.strftime("%Y-%m-%d")
 
-    print(f"[{captured_at}] Starting SPX options poll")
+    logger.info("[%s] Starting SPX options poll", captured_at)
 
     # Step 1: Find ALL target expirations in DTE window
     target_expirations = find_target_expirations()
@@ -640,48 +789,70 @@ def poll_spx_options() -> Tuple[int, Optional[str]]:
     if not target_expirations:
         return (0, "No expirations found in target DTE window")
 
-    print(f"  Found {len(target_expirations)} expiration(s) in {MIN_DTE}-{MAX_DTE} DTE window:")
-    for exp, dte in target_expirations:
-        print(f"    - {exp.strftime('%Y-%m-%d')} ({dte} DTE)")
+    logger.info("  Found %d expiration(s) in %d-%d DTE window:\n%s",
+                len(target_expirations), MIN_DTE, MAX_DTE,
+                "\n".join(f"    - {exp:%Y-%m-%d} ({dte} DTE)" for exp, dte in target_expirations))
 
-    # Step 2: Get SPX spot price
-    print(f"  Fetching SPX spot price...")
-    spot_price, spot_error = fetch_spot_price()
+    # Step 2: Get SPX spot price (reuse today's last spot when available)
+    global _last_spot
+    provisional = _last_spot is not None and _last_spot[0] == captured_date
+
+    if provisional:
+        spot_price = _last_spot[1]
+        logger.info("  Provisional SPX spot (last poll): $%.2f", spot_price)
+    else:
+        logger.info("  Fetching SPX spot price...")
+        spot_price, spot_error = fetch_spot_price()
 
-    if spot_error:
-        return (0, spot_error)
+        if spot_error:
+            return (0, spot_error)
 
-    print(f"  SPX spot price: ${spot_price:.2f}")
+        logger.info("  SPX spot price: $%.2f", spot_price)
 
     # Step 3: Calculate target strike range
     min_strike = spot_price * MIN_MONEYNESS
     max_strike = spot_price * MAX_MONEYNESS
-    print(f"  Target strike range: {min_strike:.0f} - {max_strike:.0f} ({MIN_MONEYNESS:.0%} - {MAX_MONEYNESS:.0%} moneyness)")
+    logger.info("  Target strike range: %.0f - %.0f (%.0f%% - %.0f%% moneyness)",
+                min_strike, max_strike, MIN_MONEYNESS * 100, MAX_MONEYNESS * 100)
+
+    # A reused spot may have drifted, so discover a wider band and trim it
+    # once the live spot arrives with the snapshots
+    discover_min = min_strike * (1 - SPOT_DRIFT_MARGIN) if provisional else min_strike
+    discover_max = max_strike * (1 + SPOT_DRIFT_MARGIN) if provisional else max_strike
 
     # Step 4: Discover contracts for each expiration
-    print(f"  Discovering contracts across expirations...")
+    logger.info("  Discovering contracts across expirations...")
     all_tickers = []
     expiration_counts = {}
     errors = []
-
-    for exp, dte in target_expirations:
-        exp_str = exp.strftime("%Y-%m-%d")
-
-        tickers, error = fetch_expiration_contracts(
-            expiration_str=exp_str,
-            spot_price=spot_price,
-            min_strike=min_strike,
-            max_strike=max_strike
-        )
-
+    discovery_lines = []
+
+    # Each expiration is an independent round-trip, so fetch them
+    # concurrently and walk the results in expiration order
+    exp_strs = [exp.strftime("%Y-%m-%d") for exp, _ in target_expirations]
+    with ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS) as executor:
+        discovered = list(executor.map(
+            lambda exp_str: fetch_expiration_contracts(
+                expiration_str=exp_str,
+                spot_price=spot_price,
+                min_strike=discover_min,
+                max_strike=discover_max
+            ),
+            exp_strs
+        ))
+
+    for (_, dte), exp_str, (tickers, error) in zip(target_expirations, exp_strs, discovered):
         if error:
             errors.append(error)
-            print(f"    [WARN] {exp_str}: {error}")
+            logger.warning("    %s: %s", exp_str, error)
             continue
 
         expiration_counts[exp_str] = len(tickers)
         all_tickers.extend(tickers)
-        print(f"    {exp_str} ({dte} DTE): {len(tickers)} contracts")
+        discovery_lines.append(f"    {exp_str} ({dte} DTE): {len(tickers)} contracts")
+
+    if discovery_lines:
+        logger.info("\n".join(discovery_lines))
 
     if errors and not all_tickers:
         return (0, f"All expirations failed: {'; '.join(errors)}")
@@ -689,54 +860,82 @@ def poll_spx_options() -> Tuple[int, Optional[str]]:
     if not all_tickers:
         return (0, "No contracts found in target range across all expirations")
 
-    print(f"  Total contracts to fetch: {len(all_tickers)}")
+    logger.info("  Total contracts to fetch: %d", len(all_tickers))
 
     # Step 5: Fetch detailed data via unified snapshot (batched)
-    print(f"  Fetching detailed data...")
+    logger.info("  Fetching detailed data...")
     try:
         unified_results = fetch_unified_snapshot_batched(all_tickers)
     except requests.exceptions.RequestException as e:
         return (0, f"Unified snapshot batch API error: {e}")
 
-    print(f"  Received {len(unified_results)} detailed contracts")
+    logger.info("  Received %d detailed contracts", len(unified_results))
 
     if not unified_results:
         return (0, "Unified snapshot returned no results")
 
+    # Every snapshot carries the underlying value; prefer it as the spot
+    live_spot = spot_from_results(unified_results)
+    if live_spot:
+        spot_price = live_spot
+
+    if provisional:
+        min_strike = spot_price * MIN_MONEYNESS
+        max_strike = spot_price * MAX_MONEYNESS
+        unified_results = [
+            contract for contract in unified_results
+            if min_strike <= contract.get("details", {}).get("strike_price", 0) <= max_strike
+        ]
+        expiration_counts = {exp_str: 0 for exp_str in expiration_counts}
+        for contract in unified_results:
+            exp_str = contract.get("details", {}).get("expiration_date")
+            if exp_str in expiration_counts:
+                expiration_counts[exp_str] += 1
+        logger.info("  SPX spot price: $%.2f (%d contracts in range)", spot_price, len(unified_results))
+
+        if not unified_results:
+            return (0, "No contracts in target range at live spot price")
+
+    _last_spot = (captured_date, spot_price)
+
     # Step 6: Transform to database format
-    snapshots = []
-    for contract in unified_results:
-        snapshot = transform_to_snapshot(
-            contract=contract,
-            captured_at=captured_at,
-            captured_date=captured_date,
-            spot_price=spot_price
-        )
-        snapshots.append(snapshot)
+    cap_date = date.fromisoformat(captured_date)
+    snapshots = [
+        transform_to_snapshot(contract, captured_at, captured_date, spot_price, cap_date)
+        for contract in unified_results
+    ]
 
     # Step 7: Store in database
-    print(f"  Storing {len(snapshots)} snapshots in database...")
+    logger.info("  Storing %d snapshots in database...", len(snapshots))
     try:
-        db = SPXDatabase(DB_PATH)
-        count = db.insert_intraday_batch(snapshots)
-        print(f"  Successfully stored {count} snapshots")
-
-        # Log breakdown by expiration
-        print(f"  Breakdown by expiration:")
-        for exp_str, exp_count in expiration_counts.items():
-            print(f"    {exp_str}: {exp_count} contracts")
-
-        # Step 8: Run anomaly detection
-        if DETECTION_ENABLED:
-            print(f"  Running anomaly detection...")
-            alerts = detect_anomalies(snapshots, db, captured_at)
-            log_alerts(alerts)
-
-            if ALERT_STORAGE_ENABLED and alerts:
-                stored = store_alerts(alerts, db)
-                print(f"  Stored {stored} alert(s) to database")
-
-        db.close()
+        with get_pool(DB_PATH, size=1).acquire() as db:
+            # Snapshots and alerts for one poll share a single transaction
+            with db.transaction():
+                count = db.insert_intraday_batch(snapshots)
+                logger.info("  Successfully stored %d snapshots", count)
+
+                # Log breakdown by expiration
+                logger.info("  Breakdown by expiration:\n%s", "\n".join(
+                    f"    {exp_str}: {exp_count} contracts"
+                    for exp_str, exp_count in expiration_counts.items()
+                ))
+
+                # Step 8: Run anomaly detection. A failure here must not cost
+                # the poll's market data: undo only the alert writes and let
+                # the snapshots commit
+                if DETECTION_ENABLED:
+                    logger.info("  Running anomaly detection...")
+                    try:
+                        with db.savepoint("detection"):
+                            alerts = detect_anomalies(snapshots, db, captured_at)
+                            log_alerts(alerts)
+
+                            if ALERT_STORAGE_ENABLED and alerts:
+                                stored = store_alerts(alerts, db)
+                                logger.info("  Stored %d alert(s) to database", stored)
+                    except Exception:
+                        logger.exception("  Anomaly detection failed; snapshots kept")
+
         return (count, None)
     except Exception as e:
         return (0, f"Database error: {e}")
@@ -744,6 +943,8 @@ def poll_spx_options() -> Tuple[int, Optional[str]]:
 
 def main():
     """Main entry point."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     if not API_KEY:
         print("ERROR: No API key found!")
         print("Set POLYGON_API_KEY or MASSIVE_API_KEY environment variable")
@@ -19,13 +19,17 @@ Production (systemd):
 
 import os
 import sys
-import time
+import json
 import signal
+import threading
 import logging
+import logging.handlers
+from bisect import bisect_right
+from functools import lru_cache
 from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 # =============================================================================
 # SCHEDULER CONFIGURATION
@@ -54,6 +58,12 @@ RETRY_DELAY_SECONDS = 60
 LOG_LEVEL = "INFO"
 LOG_TO_FILE = True
 LOG_DIR = "logs"
+LOG_BACKUP_DAYS = 30             # Rotated daily files kept
+
+# Optional JSON file of extra calendar dates, merged over the built-in lists:
+#   {"holidays": ["2028-01-17", ...], "early_close": ["2028-11-24", ...]}
+# Read at startup and again on SIGUSR1.
+CALENDAR_FILE = os.environ.get('SPX_CALENDAR_FILE')
 
 # =============================================================================
 # MARKET CALENDAR
@@ -113,6 +123,14 @@ EARLY_CLOSE_DAYS = {
     "2027-11-26",   # Day after Thanksgiving
 }
 
+# Parsed once at import so calendar checks compare dates directly
+MARKET_HOLIDAYS = frozenset(map(date.fromisoformat, MARKET_HOLIDAYS))
+EARLY_CLOSE_DAYS = frozenset(map(date.fromisoformat, EARLY_CLOSE_DAYS))
+
+# Built-in lists, kept so a calendar reload starts from them again
+_BUILTIN_HOLIDAYS = MARKET_HOLIDAYS
+_BUILTIN_EARLY_CLOSE_DAYS = EARLY_CLOSE_DAYS
+
 # =============================================================================
 # TIMEZONE UTILITIES
 # =============================================================================
@@ -148,13 +166,13 @@ def is_weekend(d: Optional[date] = None) -> bool:
 def is_holiday(d: Optional[date] = None) -> bool:
     """Check if date is a market holiday."""
     d = d or today_et()
-    return d.isoformat() in MARKET_HOLIDAYS
+    return d in MARKET_HOLIDAYS
 
 
 def is_early_close(d: Optional[date] = None) -> bool:
     """Check if date is an early close day (1:00 PM)."""
     d = d or today_et()
-    return d.isoformat() in EARLY_CLOSE_DAYS
+    return d in EARLY_CLOSE_DAYS
 
 
 def is_trading_day(d: Optional[date] = None) -> bool:
@@ -163,39 +181,78 @@ def is_trading_day(d: Optional[date] = None) -> bool:
     return not is_weekend(d) and not is_holiday(d)
 
 
-def get_market_open(d: Optional[date] = None) -> datetime:
-    """Get market open time for given date."""
-    d = d or today_et()
+# The session times for a date never change, and the main loop asks for
+# them on every pass, so each is computed once per date.
+
+@lru_cache(maxsize=16)
+def _market_open(d: date) -> datetime:
     return make_et_datetime(d, MARKET_OPEN_HOUR, MARKET_OPEN_MINUTE)
 
 
-def get_market_close(d: Optional[date] = None) -> datetime:
-    """Get market close time for given date (handles early close)."""
-    d = d or today_et()
+@lru_cache(maxsize=16)
+def _market_close(d: date) -> datetime:
     if is_early_close(d):
         return make_et_datetime(d, EARLY_CLOSE_HOUR, EARLY_CLOSE_MINUTE)
     return make_et_datetime(d, MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE)
 
 
+@lru_cache(maxsize=16)
+def _first_poll_time(d: date) -> datetime:
+    return _market_open(d) + timedelta(minutes=FIRST_POLL_DELAY_MINUTES)
+
+
+@lru_cache(maxsize=16)
+def _eod_time(d: date) -> datetime:
+    return _market_close(d) + timedelta(minutes=EOD_DELAY_MINUTES)
+
+
+def get_market_open(d: Optional[date] = None) -> datetime:
+    """Get market open time for given date."""
+    return _market_open(d or today_et())
+
+
+def get_market_close(d: Optional[date] = None) -> datetime:
+    """Get market close time for given date (handles early close)."""
+    return _market_close(d or today_et())
+
+
 def get_first_poll_time(d: Optional[date] = None) -> datetime:
     """Get first poll time (market open + data delay)."""
-    d = d or today_et()
-    market_open = get_market_open(d)
-    return market_open + timedelta(minutes=FIRST_POLL_DELAY_MINUTES)
+    return _first_poll_time(d or today_et())
 
 
 def get_eod_time(d: Optional[date] = None) -> datetime:
     """Get EOD consolidation time (close + delay for data to settle)."""
-    d = d or today_et()
-    market_close = get_market_close(d)
-    return market_close + timedelta(minutes=EOD_DELAY_MINUTES)
+    return _eod_time(d or today_et())
+
+
+def build_trading_days(holidays) -> List[date]:
+    """Sorted weekday non-holidays for every calendar year the holidays cover."""
+    years = {h.year for h in holidays}
+    day = date(min(years), 1, 1)
+    end = date(max(years), 12, 31)
+    days = []
+    while day <= end:
+        if day.weekday() < 5 and day not in holidays:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+TRADING_DAYS = build_trading_days(MARKET_HOLIDAYS)
 
 
 def next_trading_day(d: Optional[date] = None) -> date:
     """Find the next trading day after given date."""
     d = d or today_et()
     candidate = d + timedelta(days=1)
-    # Safety limit to prevent infinite loop
+
+    i = bisect_right(TRADING_DAYS, d)
+    if i < len(TRADING_DAYS) and candidate.year >= TRADING_DAYS[0].year:
+        return TRADING_DAYS[i]
+
+    # Outside the calendar years: fall back to a forward search, with a
+    # safety limit to prevent an infinite loop
     for _ in range(10):
         if is_trading_day(candidate):
             return candidate
@@ -203,16 +260,91 @@ def next_trading_day(d: Optional[date] = None) -> date:
     return candidate
 
 
+def reload_calendar(path: Optional[str] = CALENDAR_FILE) -> bool:
+    """
+    Merge the dates in the calendar file over the built-in lists.
+
+    Rebuilds TRADING_DAYS and drops cached session times. On a missing or
+    malformed file the current calendar is kept.
+
+    Returns:
+        True if the calendar was updated
+    """
+    global MARKET_HOLIDAYS, EARLY_CLOSE_DAYS, TRADING_DAYS
+
+    if not path:
+        return False
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            extra = json.load(f)
+        holidays = _BUILTIN_HOLIDAYS | set(map(date.fromisoformat, extra.get('holidays', [])))
+        early_close = _BUILTIN_EARLY_CLOSE_DAYS | set(map(date.fromisoformat, extra.get('early_close', [])))
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        log("Calendar file %s not loaded: %s", "ERROR", path, e)
+        return False
+
+    MARKET_HOLIDAYS = frozenset(holidays)
+    EARLY_CLOSE_DAYS = frozenset(early_close)
+    TRADING_DAYS = build_trading_days(MARKET_HOLIDAYS)
+    for cached in (_market_open, _market_close, _first_poll_time, _eod_time):
+        cached.cache_clear()
+
+    log("Calendar loaded from %s: %d holidays, %d early closes", "INFO",
+        path, len(MARKET_HOLIDAYS), len(EARLY_CLOSE_DAYS))
+    return True
+
+
 # =============================================================================
 # LOGGING
 # =============================================================================
 
 logger = None
+_file_handler = None
+
+
+class TradingDayFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    Log file that rolls over when the ET trading date changes.
+
+    TimedRotatingFileHandler's own midnight is host-local, which on a UTC
+    host splits one trading day across two files. Rotation is instead driven
+    by the main loop's date-rollover check; the base class supplies the
+    rotated-file naming and backupCount pruning.
+    """
+
+    def shouldRollover(self, record) -> bool:
+        return False
+
+    def rollover_to(self, day: date):
+        """Move the current file aside as <file>.<day> and start a new one."""
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            dfn = self.rotation_filename(f"{self.baseFilename}.{day.isoformat()}")
+            if os.path.exists(dfn):
+                os.remove(dfn)
+            self.rotate(self.baseFilename, dfn)
+            if self.backupCount > 0:
+                for old_file in self.getFilesToDelete():
+                    os.remove(old_file)
+            if not self.delay:
+                self.stream = self._open()
+        finally:
+            self.release()
+
+
+def rotate_log(day: date):
+    """Close out the log file for a finished trading day."""
+    if _file_handler is not None:
+        _file_handler.rollover_to(day)
 
 
 def setup_logging() -> logging.Logger:
     """Configure dual logging to console and file."""
-    global logger
+    global logger, _file_handler
 
     log_format = "%(asctime)s [%(levelname)s] %(message)s"
     date_format = "%Y-%m-%d %H:%M:%S"
@@ -227,25 +359,38 @@ def setup_logging() -> logging.Logger:
     console.setFormatter(logging.Formatter(log_format, date_format))
     logger.addHandler(console)
 
-    # File handler (daily log files)
+    # File handler (rolls over to a new file at midnight ET)
     if LOG_TO_FILE:
         log_dir = Path(LOG_DIR)
         log_dir.mkdir(exist_ok=True)
-        log_file = log_dir / f"scheduler_{today_et().isoformat()}.log"
+        log_file = log_dir / "scheduler.log"
 
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setFormatter(logging.Formatter(log_format, date_format))
-        logger.addHandler(file_handler)
+        _file_handler = TradingDayFileHandler(
+            log_file, when='midnight', backupCount=LOG_BACKUP_DAYS, encoding='utf-8'
+        )
+        _file_handler.setFormatter(logging.Formatter(log_format, date_format))
+        logger.addHandler(_file_handler)
+
+        # A file left by a run on an earlier day is rotated out on startup
+        if log_file.stat().st_size:
+            last_day = datetime.fromtimestamp(log_file.stat().st_mtime, ET).date()
+            if last_day != today_et():
+                _file_handler.rollover_to(last_day)
 
     return logger
 
 
-def log(message: str, level: str = "INFO"):
-    """Log a message."""
+def log(message: str, level: str = "INFO", *args):
+    """
+    Log a message.
+
+    Extra args are %-substituted into the message by the logger, only if the
+    record is actually emitted.
+    """
     if logger:
-        getattr(logger, level.lower())(message)
+        getattr(logger, level.lower())(message, *args)
     else:
-        print(f"[{level}] {message}")
+        print(f"[{level}] {message % args if args else message}")
 
 
 def log_banner(title: str):
@@ -259,26 +404,34 @@ def log_banner(title: str):
 # GRACEFUL SHUTDOWN
 # =============================================================================
 
-shutdown_requested = False
+_SHUTDOWN = threading.Event()
+_WAKE = threading.Event()  # Cuts the current sleep short (shutdown or reload)
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
-    global shutdown_requested
     log("Shutdown signal received (Ctrl+C or SIGTERM)")
-    shutdown_requested = True
+    _SHUTDOWN.set()
+    _WAKE.set()
+
+
+def reload_signal_handler(signum, frame):
+    """Handle SIGUSR1 - reload the calendar file without restarting."""
+    log("Reload signal received (SIGUSR1)")
+    reload_calendar()
+    _WAKE.set()
 
 
 def sleep_interruptible(seconds: float):
     """
-    Sleep that can be interrupted by shutdown signal.
-    Sleeps in 1-second chunks to allow responsive shutdown.
+    Sleep that can be interrupted by shutdown or calendar reload signals.
+    Blocks on the wake event, so the signal handlers end it immediately.
+    After a reload it returns early and the state handler recomputes its
+    wake time from the new calendar.
     """
-    end_time = time.time() + seconds
-    while time.time() < end_time and not shutdown_requested:
-        time.sleep(min(1.0, end_time - time.time()))
-
-    if shutdown_requested:
+    _WAKE.wait(timeout=max(seconds, 0))
+    _WAKE.clear()
+    if _SHUTDOWN.is_set():
         raise KeyboardInterrupt("Shutdown requested")
 
 
@@ -310,14 +463,14 @@ def run_poll_with_retry() -> Tuple[int, Optional[str]]:
                 return (count, None)
 
             last_error = error
-            log(f"Poll attempt {attempt}/{MAX_POLL_RETRIES} failed: {error}", "WARNING")
+            log("Poll attempt %d/%d failed: %s", "WARNING", attempt, MAX_POLL_RETRIES, error)
 
         except Exception as e:
             last_error = str(e)
-            log(f"Poll attempt {attempt}/{MAX_POLL_RETRIES} exception: {e}", "ERROR")
+            log("Poll attempt %d/%d exception: %s", "ERROR", attempt, MAX_POLL_RETRIES, e)
 
         if attempt < MAX_POLL_RETRIES:
-            log(f"Retrying in {RETRY_DELAY_SECONDS} seconds...")
+            log("Retrying in %d seconds...", "INFO", RETRY_DELAY_SECONDS)
             sleep_interruptible(RETRY_DELAY_SECONDS)
 
     return (0, f"All {MAX_POLL_RETRIES} attempts failed. Last error: {last_error}")
@@ -458,7 +611,7 @@ def handle_waiting_for_open() -> str:
 
     log(f"Waiting for market. First poll at {first_poll.strftime('%H:%M')} ET ({sleep_seconds/60:.0f} min)")
 
-    sleep_interruptible(min(sleep_seconds, 60))
+    sleep_interruptible(sleep_seconds)
 
     return SchedulerState.WAITING_FOR_OPEN
 
@@ -493,31 +646,31 @@ def handle_market_open(poll_count: int, last_poll_time: Optional[datetime]) -> T
 
     if should_poll:
         poll_count += 1
-        log(f"Running poll #{poll_count}...")
+        log("Running poll #%d...", "INFO", poll_count)
 
         count, error = run_poll_with_retry()
 
         if error:
-            log(f"[POLL FAILED] {error}", "ERROR")
+            log("[POLL FAILED] %s", "ERROR", error)
         else:
-            log(f"[POLL OK] Stored {count} contracts")
+            log("[POLL OK] Stored %d contracts", "INFO", count)
 
         last_poll_time = now_et()
 
         next_poll_time = last_poll_time + timedelta(minutes=POLL_INTERVAL_MINUTES)
 
         if next_poll_time < market_close:
-            log(f"Next poll at {next_poll_time.strftime('%H:%M')} ET")
+            log("Next poll at %s ET", "INFO", next_poll_time.strftime('%H:%M'))
         else:
             close_str = market_close.strftime('%H:%M')
-            log(f"No more polls scheduled. Market closes at {close_str} ET")
+            log("No more polls scheduled. Market closes at %s ET", "INFO", close_str)
     else:
         next_poll_time = last_poll_time + timedelta(minutes=POLL_INTERVAL_MINUTES)
         sleep_until = min(next_poll_time, market_close)
         sleep_seconds = (sleep_until - now).total_seconds()
 
         if sleep_seconds > 0:
-            sleep_interruptible(min(sleep_seconds, 60))
+            sleep_interruptible(sleep_seconds)
 
     return (SchedulerState.MARKET_OPEN, poll_count, last_poll_time)
 
@@ -536,7 +689,7 @@ def handle_eod_pending() -> str:
     remaining_seconds = (eod_time - now).total_seconds()
     log(f"EOD pending. Will run at {eod_time.strftime('%H:%M')} ET ({remaining_seconds/60:.0f} min remaining)")
 
-    sleep_interruptible(min(remaining_seconds, 60))
+    sleep_interruptible(remaining_seconds)
 
     return SchedulerState.EOD_PENDING
 
@@ -585,15 +738,19 @@ def handle_market_closed() -> str:
 
 def main():
     """Main scheduler entry point."""
-    global shutdown_requested
-
     # Set up signal handlers for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    if hasattr(signal, 'SIGUSR1'):
+        # Reloads the calendar and wakes any sleep to recompute its target
+        signal.signal(signal.SIGUSR1, reload_signal_handler)
 
     # Initialize logging
     setup_logging()
 
+    # Extra calendar dates, if configured
+    reload_calendar()
+
     # Startup banner
     log_banner("SPX Options Scheduler")
     log(f"Poll interval: {POLL_INTERVAL_MINUTES} minutes")
@@ -617,7 +774,7 @@ def main():
     current_date = today_et()
 
     # Main loop
-    while not shutdown_requested:
+    while not _SHUTDOWN.is_set():
         try:
             now = now_et()
             today = today_et()
@@ -625,14 +782,12 @@ def main():
             # Reset daily counters at date change
             if today != current_date:
                 log(f"Date changed: {current_date} -> {today}")
+                rotate_log(current_date)
                 poll_count_today = 0
                 last_poll_time = None
                 eod_completed_today = False
                 current_date = today
 
-                # Re-setup logging for new day's log file
-                setup_logging()
-
                 # Check if new day is early close
                 if is_early_close(today):
                     log(f"NOTE: Today is an early close day (1:00 PM ET)")
@@ -10,18 +10,27 @@ Run:
 Then open http://localhost:5000 in browser.
 """
 
+import hashlib
 import os
 import sys
-import json
-from flask import Flask, jsonify, send_from_directory, request
-from datetime import date, datetime, timedelta
+import threading
+from collections import OrderedDict
+from flask import Flask, jsonify, send_from_directory, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from datetime import date, timedelta
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 # Handle imports whether run as module or standalone
 try:
-    from .database import SPXDatabase
+    from .database import ALERT_TRIGGER_FLAGS, INTRADAY_INSERT_COLUMNS, get_pool
 except ImportError:
-    from database import SPXDatabase
+    from database import ALERT_TRIGGER_FLAGS, INTRADAY_INSERT_COLUMNS, get_pool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load .env if available
 try:
@@ -41,7 +50,49 @@ HOST = os.environ.get('SPX_HOST', '127.0.0.1')
 PORT = int(os.environ.get('SPX_PORT', '5050'))
 DEBUG = os.environ.get('SPX_DEBUG', 'false').lower() in ('true', '1', 'yes')
 
+# Waitress tuning
+WAITRESS_THREADS = int(os.environ.get('SPX_THREADS', '8'))
+WAITRESS_CONNECTION_LIMIT = 200
+WAITRESS_CHANNEL_TIMEOUT = 30    # Seconds before an idle connection is closed
+
+DB_POOL_SIZE = WAITRESS_THREADS  # One connection per request thread
+
+ENRICHED_CACHE_SIZE = 32         # Serialized enriched responses kept in memory
+STREAM_BATCH_ROWS = 500          # Rows encoded per chunk of a streamed response
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson.
+
+    The stdlib encoder dominates CPU time on the multi-thousand-row API
+    responses. Output keeps Flask's sorted keys; pretty-printed (debug)
+    responses and explicit encoder options still go through the stdlib.
+    """
+
+    _OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+
+    def response(self, *args, **kwargs):
+        compact = self.compact or (self.compact is None and not self._app.debug)
+        if orjson is None or not compact:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__, static_folder=str(STATIC_DIR))
+app.json = ORJSONProvider(app)
+
+# Long-lived read-only connections shared by all request handlers; the
+# poller and EOD job write through their own connections
+_pool = get_pool(DB_PATH, size=DB_POOL_SIZE, read_only=True)
 
 
 # =============================================================================
@@ -73,106 +124,147 @@ def serve_js(filename):
 # API ROUTES
 # =============================================================================
 
+# Stored intraday columns returned by the API (the generated captured_hour
+# column is an index helper, not part of the payload)
+_INTRADAY_COLUMNS = ', '.join(('id',) + INTRADAY_INSERT_COLUMNS)
+
+
+def _dict_rows(cursor) -> List[Dict]:
+    """Fetch all rows as plain dicts, skipping the sqlite3.Row wrapper."""
+    cursor.row_factory = None
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def _stream_rows(sql: str, params: tuple):
+    """
+    Stream a query's rows to the client as a JSON array of objects.
+
+    Rows are fetched and encoded STREAM_BATCH_ROWS at a time, so neither the
+    result set nor the encoded body is ever held in memory whole. A pooled
+    connection stays checked out until the last chunk has been sent.
+    """
+    encode = app.json.dumps
+
+    def generate():
+        with _pool.acquire() as db:
+            cursor = db.conn.execute(sql, params)
+            cursor.row_factory = None
+            columns = [column[0] for column in cursor.description]
+            separator = '['
+            while True:
+                batch = cursor.fetchmany(STREAM_BATCH_ROWS)
+                if not batch:
+                    break
+                yield separator + ','.join(encode(dict(zip(columns, row))) for row in batch)
+                separator = ','
+            yield '[]\n' if separator == '[' else ']\n'
+
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
+
+
 @app.route('/api/expirations')
 @app.route('/spx/api/expirations')
 def get_expirations():
     """Get list of available expirations in the database."""
-    db = SPXDatabase(DB_PATH)
-
-    # Get expirations from intraday (recent data)
-    cursor = db.conn.execute("""
-        SELECT DISTINCT expiration,
-               MIN(dte) as dte,
-               COUNT(DISTINCT ticker) as contract_count
-        FROM intraday_snapshots
-        WHERE captured_date = ?
-        GROUP BY expiration
-        ORDER BY expiration ASC
-    """, (date.today().isoformat(),))
+    with _pool.acquire() as db:
+        # Get expirations from intraday (recent data)
+        cursor = db.conn.execute("""
+            SELECT DISTINCT expiration,
+                   MIN(dte) as dte,
+                   COUNT(DISTINCT ticker) as contract_count
+            FROM intraday_snapshots
+            WHERE captured_date = ?
+            GROUP BY expiration
+            ORDER BY expiration ASC
+        """, (date.today().isoformat(),))
 
-    intraday_exps = [dict(row) for row in cursor.fetchall()]
+        intraday_exps = _dict_rows(cursor)
 
-    # Get expirations from daily history
-    cursor = db.conn.execute("""
-        SELECT DISTINCT expiration,
-               MIN(dte) as dte,
-               COUNT(DISTINCT ticker) as contract_count
-        FROM daily_history
-        GROUP BY expiration
-        ORDER BY expiration ASC
-    """)
+        # Get expirations from daily history
+        cursor = db.conn.execute("""
+            SELECT DISTINCT expiration,
+                   MIN(dte) as dte,
+                   COUNT(DISTINCT ticker) as contract_count
+            FROM daily_history
+            GROUP BY expiration
+            ORDER BY expiration ASC
+        """)
 
-    daily_exps = [dict(row) for row in cursor.fetchall()]
+        daily_exps = _dict_rows(cursor)
 
-    db.close()
-    return jsonify({
-        'intraday': intraday_exps,
-        'daily': daily_exps
-    })
+        return jsonify({
+            'intraday': intraday_exps,
+            'daily': daily_exps
+        })
 
 
 @app.route('/api/intraday')
 @app.route('/spx/api/intraday')
 def get_intraday():
     """Get today's intraday snapshots. Optional expiration filter."""
-    db = SPXDatabase(DB_PATH)
     today = date.today().isoformat()
     expiration = request.args.get('expiration')
 
     if expiration:
-        cursor = db.conn.execute("""
-            SELECT * FROM intraday_snapshots
+        return _stream_rows(f"""
+            SELECT {_INTRADAY_COLUMNS} FROM intraday_snapshots
             WHERE captured_date = ? AND expiration = ?
             ORDER BY captured_at DESC, strike ASC
         """, (today, expiration))
-    else:
-        cursor = db.conn.execute("""
-            SELECT * FROM intraday_snapshots
-            WHERE captured_date = ?
-            ORDER BY captured_at DESC, strike ASC
-        """, (today,))
 
-    rows = [dict(row) for row in cursor.fetchall()]
-    db.close()
-    return jsonify(rows)
+    return _stream_rows(f"""
+        SELECT {_INTRADAY_COLUMNS} FROM intraday_snapshots
+        WHERE captured_date = ?
+        ORDER BY captured_at DESC, strike ASC
+    """, (today,))
 
 
 @app.route('/api/intraday/latest')
 @app.route('/spx/api/intraday/latest')
 def get_latest_poll():
     """Get the most recent poll's data. Optional expiration filter."""
-    db = SPXDatabase(DB_PATH)
-    expiration = request.args.get('expiration')
+    with _pool.acquire() as db:
+        expiration = request.args.get('expiration')
 
-    # Get latest captured_at
-    cursor = db.conn.execute("""
-        SELECT DISTINCT captured_at
-        FROM intraday_snapshots
-        ORDER BY captured_at DESC
-        LIMIT 1
-    """)
-    latest = cursor.fetchone()
+        # Get latest captured_at
+        cursor = db.conn.execute("""
+            SELECT DISTINCT captured_at
+            FROM intraday_snapshots
+            ORDER BY captured_at DESC
+            LIMIT 1
+        """)
+        latest = cursor.fetchone()
+
+        if not latest:
+            return jsonify([])
+
+        if expiration:
+            cursor = db.conn.execute(f"""
+                SELECT {_INTRADAY_COLUMNS} FROM intraday_snapshots
+                WHERE captured_at = ? AND expiration = ?
+                ORDER BY strike ASC
+            """, (latest[0], expiration))
+        else:
+            cursor = db.conn.execute(f"""
+                SELECT {_INTRADAY_COLUMNS} FROM intraday_snapshots
+                WHERE captured_at = ?
+                ORDER BY strike ASC
+            """, (latest[0],))
 
-    if not latest:
-        db.close()
-        return jsonify([])
+        rows = _dict_rows(cursor)
+        return jsonify(rows)
 
-    if expiration:
-        cursor = db.conn.execute("""
-            SELECT * FROM intraday_snapshots
-            WHERE captured_at = ? AND expiration = ?
-            ORDER BY strike ASC
-        """, (latest[0], expiration))
-    else:
-        cursor = db.conn.execute("""
-            SELECT * FROM intraday_snapshots
-            WHERE captured_at = ?
-            ORDER BY strike ASC
-        """, (latest[0],))
 
-    rows = [dict(row) for row in cursor.fetchall()]
-    db.close()
-    return jsonify(rows)
+def _round(value: Optional[float], digits: int) -> Optional[float]:
+    """round() that passes NULL results through."""
+    return round(value, digits) if value is not None else None
+
+
+# Serialized enriched responses, keyed by (latest poll, latest alert id,
+# latest EOD date, expiration filter); least recently used evicted first
+_enriched_cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+_enriched_lock = threading.Lock()
 
 
 @app.route('/api/intraday/latest/enriched')
@@ -188,217 +280,220 @@ def get_latest_enriched():
     - OI changes from yesterday
     - Alert flags for each contract
     """
-    db = SPXDatabase(DB_PATH)
     expiration_filter = request.args.get('expiration')
 
-    # Step 1: Get latest captured_at timestamp
-    cursor = db.conn.execute("""
-        SELECT DISTINCT captured_at
+    with _pool.acquire() as db:
+        # The response only changes when a poll, an alert or an EOD
+        # consolidation lands; all three are cheap index-edge lookups
+        key = tuple(db.conn.execute("""
+            SELECT (SELECT MAX(captured_at) FROM intraday_snapshots),
+                   (SELECT MAX(id) FROM alerts),
+                   (SELECT MAX(trade_date) FROM daily_history)
+        """).fetchone()) + (expiration_filter,)
+
+        with _enriched_lock:
+            body = _enriched_cache.get(key)
+            if body is not None:
+                _enriched_cache.move_to_end(key)
+
+        if body is None:
+            body = jsonify(_build_enriched(db, expiration_filter)).get_data()
+            with _enriched_lock:
+                _enriched_cache[key] = body
+                while len(_enriched_cache) > ENRICHED_CACHE_SIZE:
+                    _enriched_cache.popitem(last=False)
+
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(hashlib.sha1(repr(key).encode()).hexdigest())
+    return response.make_conditional(request)
+
+
+# One statement: the latest poll's rows, each joined to yesterday's
+# same-hour snapshot (closest hour within ±1, earliest on ties; read from
+# the EOD hour rollup, or from yesterday's raw polls until it has run),
+# yesterday's EOD row and today's alert flags. The day-over-day
+# arithmetic is done in SQL; Python only rounds and shapes the output.
+# COALESCE(NULLIF(x, 0), ...) mirrors Python's `x or ...` fallbacks.
+_ENRICHED_SQL = """
+    WITH latest AS (
+        SELECT captured_at AS ts,
+               SUBSTR(captured_at, 1, 10) AS today,
+               DATE(captured_at, '-1 day') AS yesterday,
+               DATE(captured_at, '+1 day') AS tomorrow,
+               CAST(SUBSTR(captured_at, 12, 2) AS INTEGER) AS hour
         FROM intraday_snapshots
         ORDER BY captured_at DESC
         LIMIT 1
-    """)
-    latest_row = cursor.fetchone()
-
-    if not latest_row:
-        db.close()
-        return jsonify({'data': [], 'meta': {'error': 'No data available'}})
+    ),
+    yhour_src AS (
+        SELECT r.ticker, r.hour, r.volume_cumulative, r.close_price, r.vwap, r.captured_at
+        FROM intraday_hour_rollup r, latest
+        WHERE r.trade_date = latest.yesterday
+          AND r.hour BETWEEN MAX(0, latest.hour - 1) AND MIN(23, latest.hour + 1)
+        UNION ALL
+        SELECT s.ticker, s.captured_hour, s.volume_cumulative, s.close_price, s.vwap, s.captured_at
+        FROM intraday_snapshots s, latest
+        WHERE s.captured_date = latest.yesterday
+          AND s.captured_hour BETWEEN MAX(0, latest.hour - 1) AND MIN(23, latest.hour + 1)
+          AND NOT EXISTS (
+              SELECT 1 FROM intraday_hour_rollup WHERE trade_date = latest.yesterday
+          )
+    ),
+    yhour AS (
+        SELECT y.*,
+               ROW_NUMBER() OVER (
+                   PARTITION BY y.ticker
+                   ORDER BY ABS(y.hour - latest.hour), y.captured_at
+               ) AS rank
+        FROM yhour_src y, latest
+    ),
+    yeod AS (
+        SELECT d.ticker, d.volume, d.open_interest, d.close_price, d.vwap
+        FROM daily_history d, latest
+        WHERE d.trade_date = latest.yesterday
+    ),
+    al AS (
+        SELECT a.ticker,
+               MAX(a.trig_delta) AS trig_delta,
+               MAX(a.trig_multiplier) AS trig_multiplier,
+               MAX(a.trig_dormancy) AS trig_dormancy
+        FROM alerts a, latest
+        WHERE a.triggered_at >= latest.today AND a.triggered_at < latest.tomorrow
+        GROUP BY a.ticker
+    ),
+    joined AS (
+        SELECT t.*,
+               latest.today AS captured_date_latest,
+               latest.yesterday AS yesterday_date,
+               COALESCE(t.volume_cumulative, 0) AS volume_today,
+               COALESCE(NULLIF(t.close_price, 0), 0) AS close_eff,
+               COALESCE(NULLIF(t.vwap, 0), NULLIF(t.close_price, 0), 0) AS vwap_eff,
+               COALESCE(t.transactions, 0) AS transactions_eff,
+               COALESCE(yh.volume_cumulative, 0) AS volume_yesterday_hour,
+               COALESCE(NULLIF(yh.vwap, 0), NULLIF(yh.close_price, 0), 0) AS vwap_yesterday_hour,
+               COALESCE(ye.volume, 0) AS volume_yesterday_eod,
+               COALESCE(NULLIF(ye.vwap, 0), NULLIF(ye.close_price, 0), 0) AS vwap_yesterday_eod,
+               ye.open_interest AS oi_yesterday,
+               al.trig_delta AS al_delta,
+               al.trig_multiplier AS al_multiplier,
+               al.trig_dormancy AS al_dormancy
+        FROM latest
+        JOIN intraday_snapshots t ON t.captured_at = latest.ts
+        LEFT JOIN yhour yh ON yh.ticker = t.ticker AND yh.rank = 1
+        LEFT JOIN yeod ye ON ye.ticker = t.ticker
+        LEFT JOIN al ON al.ticker = t.ticker
+        WHERE ? IS NULL OR t.expiration = ?
+    ),
+    priced AS (
+        SELECT joined.*,
+               CASE WHEN vwap_eff != 0
+                    THEN volume_today * vwap_eff * 100 ELSE 0 END AS notional_today,
+               CASE WHEN vwap_yesterday_hour != 0
+                    THEN volume_yesterday_hour * vwap_yesterday_hour * 100 ELSE 0 END AS notional_yesterday_hour,
+               CASE WHEN vwap_yesterday_eod != 0
+                    THEN volume_yesterday_eod * vwap_yesterday_eod * 100 ELSE 0 END AS notional_yesterday_eod,
+               open_interest - oi_yesterday AS oi_delta
+        FROM joined
+    )
+    SELECT priced.*,
+           CASE WHEN transactions_eff > 0
+                THEN CAST(volume_today AS REAL) / transactions_eff END AS avg_trade_size,
+           CASE WHEN high_price != 0 AND low_price > 0
+                THEN (high_price - low_price) / low_price * 100 END AS price_range_pct,
+           volume_today - volume_yesterday_hour AS volume_delta_hour,
+           CASE WHEN volume_yesterday_hour > 0
+                THEN CAST(volume_today - volume_yesterday_hour AS REAL) / volume_yesterday_hour * 100
+                END AS volume_pct_change_hour,
+           notional_today - notional_yesterday_hour AS notional_delta_hour,
+           volume_today - volume_yesterday_eod AS volume_delta_eod,
+           CASE WHEN volume_yesterday_eod > 0
+                THEN CAST(volume_today - volume_yesterday_eod AS REAL) / volume_yesterday_eod * 100
+                END AS volume_pct_change_eod,
+           notional_today - notional_yesterday_eod AS notional_delta_eod,
+           CASE WHEN oi_yesterday > 0
+                THEN CAST(oi_delta AS REAL) / oi_yesterday * 100 END AS oi_pct_change,
+           (SELECT captured_at FROM yhour WHERE rank = 1
+            ORDER BY ticker LIMIT 1) AS yesterday_hour_source,
+           EXISTS (SELECT 1 FROM yeod) AS has_yesterday_eod
+    FROM priced
+    ORDER BY strike ASC
+"""
 
-    captured_at = latest_row[0]
-    captured_date = captured_at[:10]
-    captured_hour = int(captured_at[11:13])
 
-    # Step 2: Get today's latest data
-    if expiration_filter:
-        cursor = db.conn.execute("""
-            SELECT * FROM intraday_snapshots
-            WHERE captured_at = ? AND expiration = ?
-            ORDER BY strike ASC
-        """, (captured_at, expiration_filter))
-    else:
-        cursor = db.conn.execute("""
-            SELECT * FROM intraday_snapshots
-            WHERE captured_at = ?
-            ORDER BY strike ASC
-        """, (captured_at,))
+def _build_enriched(db, expiration_filter: Optional[str]) -> Dict:
+    """Compute the enriched payload for the latest poll."""
+    cursor = db.conn.execute(_ENRICHED_SQL, (expiration_filter, expiration_filter))
 
-    today_data = [dict(row) for row in cursor.fetchall()]
+    today_data = cursor.fetchall()
 
     if not today_data:
-        db.close()
-        return jsonify({'data': [], 'meta': {'error': 'No data for latest poll'}})
-
-    # Step 3: Calculate yesterday's date
-    today_date_obj = datetime.strptime(captured_date, "%Y-%m-%d").date()
-    yesterday_date = (today_date_obj - timedelta(days=1)).isoformat()
-
-    # Step 4: Get yesterday's same-hour data (±1 hour tolerance)
-    hour_start = max(0, captured_hour - 1)
-    hour_end = min(23, captured_hour + 1)
-
-    cursor = db.conn.execute("""
-        SELECT ticker, volume_cumulative, open_interest, close_price, vwap, captured_at
-        FROM intraday_snapshots
-        WHERE captured_date = ?
-          AND CAST(SUBSTR(captured_at, 12, 2) AS INTEGER) BETWEEN ? AND ?
-        ORDER BY ticker, ABS(CAST(SUBSTR(captured_at, 12, 2) AS INTEGER) - ?) ASC
-    """, (yesterday_date, hour_start, hour_end, captured_hour))
-
-    yesterday_hour_data = {}
-    yesterday_hour_source = None
-    for row in cursor.fetchall():
-        ticker = row[0]
-        if ticker not in yesterday_hour_data:
-            yesterday_hour_data[ticker] = {
-                'volume': row[1] or 0,
-                'open_interest': row[2],
-                'close_price': row[3],
-                'vwap': row[4],
-                'captured_at': row[5]
-            }
-            if yesterday_hour_source is None:
-                yesterday_hour_source = row[5]
-
-    # Step 5: Get yesterday's EOD data from daily_history
-    cursor = db.conn.execute("""
-        SELECT ticker, volume, open_interest, close_price, vwap
-        FROM daily_history
-        WHERE trade_date = ?
-    """, (yesterday_date,))
-
-    yesterday_eod_data = {}
-    for row in cursor.fetchall():
-        yesterday_eod_data[row[0]] = {
-            'volume': row[1] or 0,
-            'open_interest': row[2],
-            'close_price': row[3],
-            'vwap': row[4]
-        }
-
-    # Step 6: Get today's alerts for flag information
-    cursor = db.conn.execute("""
-        SELECT ticker, trigger_reasons
-        FROM alerts
-        WHERE DATE(triggered_at) = ?
-    """, (captured_date,))
-
-    today_alerts = {}
-    for row in cursor.fetchall():
-        ticker = row[0]
-        try:
-            reasons = json.loads(row[1]) if row[1] else {}
-            flags = reasons.get('flags', [])
-        except (json.JSONDecodeError, TypeError):
-            flags = []
-
-        if ticker in today_alerts:
-            today_alerts[ticker].extend(flags)
-        else:
-            today_alerts[ticker] = flags
-
-    # Step 7: Enrich each contract
+        has_data = db.conn.execute("SELECT 1 FROM intraday_snapshots LIMIT 1").fetchone()
+        error = 'No data for latest poll' if has_data else 'No data available'
+        return {'data': [], 'meta': {'error': error}}
+
+    first = today_data[0]
+    captured_at = first['captured_at']
+    captured_date = first['captured_date_latest']
+    yesterday_date = first['yesterday_date']
+    yesterday_hour_source = first['yesterday_hour_source']
+    has_yesterday_eod = bool(first['has_yesterday_eod'])
+
+    # Shape each contract for the response
     enriched_data = []
     contracts_with_flags = 0
 
     for row in today_data:
-        ticker = row['ticker']
-
-        yest_hour = yesterday_hour_data.get(ticker, {})
-        yest_eod = yesterday_eod_data.get(ticker, {})
-        flags = list(set(today_alerts.get(ticker, [])))
+        flags = [
+            flag for flag, fired in zip(
+                ALERT_TRIGGER_FLAGS, (row['al_delta'], row['al_multiplier'], row['al_dormancy'])
+            ) if fired
+        ]
 
         if flags:
             contracts_with_flags += 1
 
-        volume_today = row.get('volume_cumulative') or 0
-        oi_today = row.get('open_interest')
-        close_price = row.get('close_price') or 0
-        vwap = row.get('vwap') or close_price
-        high_price = row.get('high_price')
-        low_price = row.get('low_price')
-        transactions = row.get('transactions') or 0
-
-        notional_today = volume_today * vwap * 100 if vwap else 0
-        avg_trade_size = round(volume_today / transactions, 1) if transactions > 0 else None
-
-        if high_price and low_price and low_price > 0:
-            price_range_pct = round(((high_price - low_price) / low_price) * 100, 2)
-        else:
-            price_range_pct = None
-
-        # Same-hour comparison
-        vol_yest_hour = yest_hour.get('volume', 0)
-        vol_delta_hour = volume_today - vol_yest_hour
-        vol_pct_hour = round((vol_delta_hour / vol_yest_hour) * 100, 1) if vol_yest_hour > 0 else None
-
-        vwap_yest_hour = yest_hour.get('vwap') or yest_hour.get('close_price') or 0
-        notional_yest_hour = vol_yest_hour * vwap_yest_hour * 100 if vwap_yest_hour else 0
-        notional_delta_hour = notional_today - notional_yest_hour
-
-        # EOD comparison
-        vol_yest_eod = yest_eod.get('volume', 0)
-        vol_delta_eod = volume_today - vol_yest_eod
-        vol_pct_eod = round((vol_delta_eod / vol_yest_eod) * 100, 1) if vol_yest_eod > 0 else None
-
-        vwap_yest_eod = yest_eod.get('vwap') or yest_eod.get('close_price') or 0
-        notional_yest_eod = vol_yest_eod * vwap_yest_eod * 100 if vwap_yest_eod else 0
-        notional_delta_eod = notional_today - notional_yest_eod
-
-        # OI comparison
-        oi_yest = yest_eod.get('open_interest')
-        if oi_today is not None and oi_yest is not None:
-            oi_delta = oi_today - oi_yest
-            oi_pct = round((oi_delta / oi_yest) * 100, 2) if oi_yest > 0 else None
-        else:
-            oi_delta = None
-            oi_pct = None
-
-        enriched = {
-            'ticker': ticker,
-            'strike': row.get('strike'),
-            'expiration': row.get('expiration'),
-            'contract_type': row.get('contract_type'),
-            'dte': row.get('dte'),
-            'moneyness': row.get('moneyness'),
-            'spot_price': row.get('spot_price'),
-            'volume_today': volume_today,
-            'volume_delta_intraday': row.get('volume_delta'),
-            'transactions': transactions,
-            'avg_trade_size': avg_trade_size,
-            'close_price': close_price,
-            'high_price': high_price,
-            'low_price': low_price,
-            'vwap': vwap,
-            'price_range_pct': price_range_pct,
-            'open_interest': oi_today,
-            'delta': row.get('delta'),
-            'gamma': row.get('gamma'),
-            'theta': row.get('theta'),
-            'vega': row.get('vega'),
-            'implied_vol': row.get('implied_vol'),
-            'market_status': row.get('market_status'),
-            'timeframe': row.get('timeframe'),
-            'notional_today': round(notional_today, 2),
-            'volume_yesterday_hour': vol_yest_hour,
-            'volume_delta_hour': vol_delta_hour,
-            'volume_pct_change_hour': vol_pct_hour,
-            'notional_yesterday_hour': round(notional_yest_hour, 2),
-            'notional_delta_hour': round(notional_delta_hour, 2),
-            'volume_yesterday_eod': vol_yest_eod,
-            'volume_delta_eod': vol_delta_eod,
-            'volume_pct_change_eod': vol_pct_eod,
-            'notional_yesterday_eod': round(notional_yest_eod, 2),
-            'notional_delta_eod': round(notional_delta_eod, 2),
-            'oi_yesterday': oi_yest,
-            'oi_delta': oi_delta,
-            'oi_pct_change': oi_pct,
+        enriched_data.append({
+            'ticker': row['ticker'],
+            'strike': row['strike'],
+            'expiration': row['expiration'],
+            'contract_type': row['contract_type'],
+            'dte': row['dte'],
+            'moneyness': row['moneyness'],
+            'spot_price': row['spot_price'],
+            'volume_today': row['volume_today'],
+            'volume_delta_intraday': row['volume_delta'],
+            'transactions': row['transactions_eff'],
+            'avg_trade_size': _round(row['avg_trade_size'], 1),
+            'close_price': row['close_eff'],
+            'high_price': row['high_price'],
+            'low_price': row['low_price'],
+            'vwap': row['vwap_eff'],
+            'price_range_pct': _round(row['price_range_pct'], 2),
+            'open_interest': row['open_interest'],
+            'delta': row['delta'],
+            'gamma': row['gamma'],
+            'theta': row['theta'],
+            'vega': row['vega'],
+            'implied_vol': row['implied_vol'],
+            'market_status': row['market_status'],
+            'timeframe': row['timeframe'],
+            'notional_today': round(row['notional_today'], 2),
+            'volume_yesterday_hour': row['volume_yesterday_hour'],
+            'volume_delta_hour': row['volume_delta_hour'],
+            'volume_pct_change_hour': _round(row['volume_pct_change_hour'], 1),
+            'notional_yesterday_hour': round(row['notional_yesterday_hour'], 2),
+            'notional_delta_hour': round(row['notional_delta_hour'], 2),
+            'volume_yesterday_eod': row['volume_yesterday_eod'],
+            'volume_delta_eod': row['volume_delta_eod'],
+            'volume_pct_change_eod': _round(row['volume_pct_change_eod'], 1),
+            'notional_yesterday_eod': round(row['notional_yesterday_eod'], 2),
+            'notional_delta_eod': round(row['notional_delta_eod'], 2),
+            'oi_yesterday': row['oi_yesterday'],
+            'oi_delta': row['oi_delta'],
+            'oi_pct_change': _round(row['oi_pct_change'], 2),
             'flags': flags,
             'flag_count': len(flags)
-        }
-
-        enriched_data.append(enriched)
-
-    db.close()
+        })
 
     response = {
         'data': enriched_data,
@@ -407,84 +502,93 @@ def get_latest_enriched():
             'captured_date': captured_date,
             'yesterday_date': yesterday_date,
             'yesterday_hour_source': yesterday_hour_source,
-            'yesterday_eod_source': yesterday_date if yesterday_eod_data else None,
+            'yesterday_eod_source': yesterday_date if has_yesterday_eod else None,
             'contracts_count': len(enriched_data),
             'contracts_with_flags': contracts_with_flags,
-            'spot_price': today_data[0].get('spot_price') if today_data else None
+            'spot_price': first['spot_price']
         }
     }
 
-    return jsonify(response)
+    return response
 
 
 @app.route('/api/daily')
 @app.route('/spx/api/daily')
 def get_daily():
     """Get daily history (last 7 days). Optional expiration filter."""
-    db = SPXDatabase(DB_PATH)
     cutoff = (date.today() - timedelta(days=7)).isoformat()
     expiration = request.args.get('expiration')
 
     if expiration:
-        cursor = db.conn.execute("""
+        return _stream_rows("""
             SELECT * FROM daily_history
             WHERE trade_date >= ? AND expiration = ?
             ORDER BY trade_date DESC, strike ASC
         """, (cutoff, expiration))
-    else:
-        cursor = db.conn.execute("""
-            SELECT * FROM daily_history
-            WHERE trade_date >= ?
-            ORDER BY trade_date DESC, strike ASC
-        """, (cutoff,))
 
-    rows = [dict(row) for row in cursor.fetchall()]
-    db.close()
-    return jsonify(rows)
+    return _stream_rows("""
+        SELECT * FROM daily_history
+        WHERE trade_date >= ?
+        ORDER BY trade_date DESC, strike ASC
+    """, (cutoff,))
 
 
 @app.route('/api/alerts')
 @app.route('/spx/api/alerts')
 def get_alerts():
     """Get recent alerts."""
-    db = SPXDatabase(DB_PATH)
-    alerts = db.get_recent_alerts(limit=50)
-    db.close()
-    return jsonify(alerts)
+    with _pool.acquire() as db:
+        alerts = db.get_recent_alerts(limit=50)
+        return jsonify(alerts)
+
+
+# (oldest, newest captured_at) the cached intraday summary was computed at
+_intraday_stats: Optional[Tuple[tuple, Dict]] = None
 
 
 @app.route('/api/stats')
 @app.route('/spx/api/stats')
 def get_stats():
     """Get database statistics."""
-    db = SPXDatabase(DB_PATH)
-
-    cursor = db.conn.execute("""
-        SELECT
-            COUNT(*) as total_rows,
-            COUNT(DISTINCT captured_at) as poll_count,
-            COUNT(DISTINCT ticker) as unique_contracts,
-            MIN(captured_at) as earliest,
-            MAX(captured_at) as latest
-        FROM intraday_snapshots
-    """)
-    intraday = dict(cursor.fetchone())
-
-    daily = db.get_daily_history_stats()
+    global _intraday_stats
+
+    with _pool.acquire() as db:
+        # The intraday summary is a full scan; recompute it only when a poll
+        # lands or retention cleanup moves the oldest snapshot
+        key = tuple(db.conn.execute("""
+            SELECT (SELECT MIN(captured_at) FROM intraday_snapshots),
+                   (SELECT MAX(captured_at) FROM intraday_snapshots)
+        """).fetchone())
+
+        cached = _intraday_stats
+        if cached is not None and cached[0] == key:
+            intraday = cached[1]
+        else:
+            cursor = db.conn.execute("""
+                SELECT
+                    COUNT(*) as total_rows,
+                    COUNT(DISTINCT captured_at) as poll_count,
+                    COUNT(DISTINCT ticker) as unique_contracts,
+                    MIN(captured_at) as earliest,
+                    MAX(captured_at) as latest
+                FROM intraday_snapshots
+            """)
+            intraday = dict(cursor.fetchone())
+            _intraday_stats = (key, intraday)
 
-    cursor = db.conn.execute("SELECT COUNT(*) as count FROM alerts")
-    alert_count = cursor.fetchone()[0]
+        daily = db.get_daily_history_stats()
 
-    size_bytes = db.get_database_size()
+        cursor = db.conn.execute("SELECT COUNT(*) as count FROM alerts")
+        alert_count = cursor.fetchone()[0]
 
-    db.close()
+        size_bytes = db.get_database_size()
 
-    return jsonify({
-        'intraday': intraday,
-        'daily': daily,
-        'alert_count': alert_count,
-        'db_size_mb': round(size_bytes / (1024 * 1024), 2)
-    })
+        return jsonify({
+            'intraday': intraday,
+            'daily': daily,
+            'alert_count': alert_count,
+            'db_size_mb': round(size_bytes / (1024 * 1024), 2)
+        })
 
 
 @app.route('/api/health')
@@ -492,10 +596,9 @@ def get_stats():
 def health_check():
     """Health check endpoint for monitoring."""
     try:
-        db = SPXDatabase(DB_PATH)
-        cursor = db.conn.execute("SELECT 1")
-        cursor.fetchone()
-        db.close()
+        with _pool.acquire() as db:
+            cursor = db.conn.execute("SELECT 1")
+            cursor.fetchone()
         return jsonify({'status': 'healthy', 'database': 'connected'})
     except Exception as e:
         return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
@@ -507,27 +610,36 @@ def health_check():
 
 def run_server():
     """Run the server with appropriate backend."""
-    is_windows = sys.platform == 'win32'
-    use_dev_mode = DEBUG or is_windows
+    serve = None
+    if not DEBUG:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("Waitress not installed, falling back to Flask")
 
     print("Starting SPX Dashboard server...")
     print(f"Database: {DB_PATH}")
     print(f"Static files: {STATIC_DIR}")
     print(f"Platform: {sys.platform}")
     print(f"Debug mode: {DEBUG}")
-    print(f"Dev mode (Flask): {use_dev_mode}")
+    print(f"Dev mode (Flask): {serve is None}")
     print(f"Listening on http://{HOST}:{PORT}")
 
-    if use_dev_mode:
+    if serve is None:
         # Development: Flask's built-in server with hot reload
-        # Also used on Windows where Waitress may not be available
         print("Using Flask development server")
         app.run(host=HOST, port=PORT, debug=DEBUG)
     else:
-        # Production: Waitress WSGI server (Linux/Mac)
-        from waitress import serve
+        # Production: Waitress WSGI server (pure Python, all platforms)
         print("Using Waitress production server")
-        serve(app, host=HOST, port=PORT)
+        serve(
+            app,
+            host=HOST,
+            port=PORT,
+            threads=WAITRESS_THREADS,
+            connection_limit=WAITRESS_CONNECTION_LIMIT,
+            channel_timeout=WAITRESS_CHANNEL_TIMEOUT
+        )
 
 
 if __name__ == '__main__':